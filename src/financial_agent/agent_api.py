@@ -1,13 +1,20 @@
-from typing import Any, Dict, List
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, NamedTuple
 from datetime import datetime, timezone
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
+import asyncio
+import functools
 import os
 
 from fastapi import FastAPI, HTTPException
 from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from .coinbase_client import CoinbaseClient
-from .cold_storage import load_cold_storage_devices
+from .coinbase_client import CoinbaseClient, balance_value
+from .decimals import ZERO, ZERO_STRS, parse_decimal, try_parse_decimal
 from . import settings
 from .portfolio_service import PortfolioService
 from .pricing_providers import CoinbasePricingProvider
@@ -15,9 +22,7 @@ from .providers.coinbase_provider import CoinbaseHoldingsProvider
 from .providers.cold_storage_provider import ColdStorageHoldingsProvider
 from .models import (
     Account,
-    AccountValuation,
-    AssetAccountBreakdown,
-    AssetValuation,
+    AccountList,
     CashBalance,
     ContainerAccount,
     ContainerAccounts,
@@ -28,307 +33,114 @@ from .models import (
     NetWorthSummary,
     PricingInfo,
     PriceQuote,
+    PriceQuotes,
     PortfolioValuation,
     PortfolioValue,
     PortfolioSnapshot,
     Position,
+    PositionList,
     TradeExecutionResponse,
     TradePreview,
     TradeRequest,
 )
 
-app = FastAPI(title="Financial Agent API")
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Close pooled Coinbase connections on shutdown.
+    coinbase_client.close()
 
-coinbase_client = CoinbaseClient()
-
-
-def _get_portfolio_service() -> PortfolioService:
-    # Providers (holdings sources)
-    providers = [
-        CoinbaseHoldingsProvider(client=coinbase_client, container_id="coinbase"),
-        ColdStorageHoldingsProvider(),
-    ]
 
-    # Pricing provider
-    provider_id = settings.get_price_provider_id()
-    if provider_id != "coinbase":
-        # Keep v1 conservative: only Coinbase pricing implemented.
-        raise HTTPException(status_code=500, detail=f"Unsupported pricing provider: {provider_id}")
-
-    pricer = CoinbasePricingProvider(client=coinbase_client)
-    return PortfolioService(providers=providers, pricer=pricer)
+# Streaming endpoints flush each record as it is produced; gzip would buffer
+# them into compressed blocks, so they are always sent uncompressed.
+_UNCOMPRESSED_PATHS = frozenset({"/agent/snapshot/stream", "/agent/snapshot.ndjson"})
 
 
-async def _compute_portfolio_valuation() -> PortfolioValuation:
-    """Compute the aggregate portfolio valuation (Coinbase + cold storage).
+class _GZipExceptStreams:
+    """GZipMiddleware that passes the streaming endpoints through untouched."""
 
-    Centralizing this keeps /agent/portfolio, /agent/networth, and container endpoints
-    consistent.
-    """
+    def __init__(self, app: ASGIApp, *, minimum_size: int) -> None:
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
 
-    try:
-        accounts: List[Dict[str, Any]] = await run_in_threadpool(coinbase_client.list_accounts)
-        prices: Dict[str, float] = await run_in_threadpool(
-            coinbase_client.get_spot_prices_for_accounts,
-            accounts,
-        )
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Coinbase error: {exc}")
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in _UNCOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await self.gzip(scope, receive, send)
 
-    # Cold storage devices (user-maintained local file).
-    try:
-        cold_devices = load_cold_storage_devices(settings.get_cold_storage_path())
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"Cold storage file error: {exc}")
 
-    ignored = settings.get_ignored_assets()
-    as_of = datetime.now(timezone.utc)
+app = FastAPI(title="Financial Agent API", lifespan=_lifespan)
+# Snapshot/portfolio payloads are repetitive JSON; compress them for clients
+# that accept gzip. Small responses are sent as-is.
+app.add_middleware(_GZipExceptStreams, minimum_size=1024)
 
-    cash: list[CashBalance] = []
-    positions: list[Position] = []
+# Quantities above this get a "double-check units" warning.
+_MAX_QTY = Decimal(1_000_000)
 
-    # Coinbase (normalized into a single container).
-    COINBASE_CONTAINER_ID = "coinbase"
+_DATETIME_ADAPTER = TypeAdapter(datetime)
 
-    coinbase_cash_totals: dict[str, Decimal] = {}
-    coinbase_position_qty: dict[str, Decimal] = {}
+# How each account currency is valued; anything not listed is a priced spot asset.
+_ASSET_KIND: dict[str, str] = dict.fromkeys(settings.CASH_CURRENCIES, "cash")
 
-    for acct in accounts:
-        currency = acct.get("currency")
-        if not isinstance(currency, str) or not currency:
-            continue
 
-        asset_upper = currency.strip().upper()
-        if asset_upper in ignored:
-            continue
+def _asset_kind(asset: Any, ignored: frozenset[str]) -> str:
+    """Classify an account currency as 'cash', 'spot', or 'skip'.
 
-        available_balance = (acct.get("available_balance") or {}).get("value")
-        hold_balance = (acct.get("hold") or {}).get("value")
-        qty = _parse_decimal(available_balance) + _parse_decimal(hold_balance)
-        if qty <= 0:
-            continue
+    Cash is never subject to FINAGENT_IGNORED_ASSETS; spot assets are.
+    """
+    if not isinstance(asset, str) or not asset:
+        return "skip"
+    kind = _ASSET_KIND.get(asset, "spot")
+    if kind == "spot" and asset.strip().upper() in ignored:
+        return "skip"
+    return kind
 
-        if asset_upper in ("USD", "USDC"):
-            coinbase_cash_totals[asset_upper] = coinbase_cash_totals.get(asset_upper, Decimal("0")) + qty
-            continue
 
-        coinbase_position_qty[asset_upper] = coinbase_position_qty.get(asset_upper, Decimal("0")) + qty
-
-    # Coinbase cash balances as holdings.
-    for cur, total_amt in sorted(coinbase_cash_totals.items(), key=lambda kv: kv[0]):
-        cash.append(
-            CashBalance(
-                source="coinbase",
-                account_id=COINBASE_CONTAINER_ID,
-                currency=cur,
-                available=None,
-                total=str(total_amt),
-            )
-        )
+def _norm_sym(value: str | None, default: str = "") -> str:
+    """Upper-cased, stripped symbol or currency code; `default` when empty."""
+    if not value:
+        return default
+    return value.strip().upper() or default
 
-    # Coinbase positions as holdings.
-    for asset, total_qty in sorted(coinbase_position_qty.items(), key=lambda kv: kv[0]):
-        price = prices.get(asset)
-        mv: Decimal | None = None
-        if price is not None:
-            mv = total_qty * Decimal(str(price))
-
-        positions.append(
-            Position(
-                source="coinbase",
-                account_id=COINBASE_CONTAINER_ID,
-                symbol=asset,
-                asset=asset,
-                quantity=str(total_qty),
-                cost_basis=None,
-                current_price=None if price is None else str(price),
-                market_value=None if mv is None else str(mv),
-                quote_currency="USD",
-            )
-        )
 
-    # Cold storage positions (valued using Coinbase spot prices).
-    cold_prices: dict[str, float] = {}
-    cold_assets = sorted({asset for d in cold_devices for asset in d.holdings.keys()})
-    for asset in cold_assets:
-        if asset.strip().upper() in ignored:
-            continue
-        if asset in ("USD", "USDC"):
-            cold_prices[asset] = 1.0
-            continue
-        try:
-            p = await run_in_threadpool(
-                coinbase_client.get_spot_price,
-                symbol_or_product_id=asset,
-                quote_currency="USD",
-            )
-        except Exception:
-            p = None
-        if p is not None:
-            cold_prices[asset] = float(p)
-
-    for device in cold_devices:
-        for asset, qty_s in device.holdings.items():
-            if asset.strip().upper() in ignored:
-                continue
-            qty = _parse_decimal(qty_s)
-            if qty <= 0:
-                continue
-
-            price = cold_prices.get(asset)
-            mv: Decimal | None = None
-            if price is not None:
-                mv = qty * Decimal(str(price))
-
-            positions.append(
-                Position(
-                    source="cold_storage",
-                    account_id=device.name,
-                    symbol=asset,
-                    asset=asset,
-                    quantity=str(qty),
-                    cost_basis=None,
-                    current_price=None if price is None else str(price),
-                    market_value=None if mv is None else str(mv),
-                    quote_currency="USD",
-                )
-            )
+coinbase_client = CoinbaseClient()
 
-    cash_total = sum((_parse_decimal(c.total) for c in cash), start=Decimal("0"))
-    positions_total = sum(
-        (_parse_decimal(p.market_value) for p in positions if p.market_value is not None),
-        start=Decimal("0"),
-    )
-    total = cash_total + positions_total
 
-    missing_prices = sorted({p.asset for p in positions if p.asset and p.market_value is None})
+def _get_portfolio_service() -> PortfolioService:
+    # Pricing provider
+    provider_id = settings.get_price_provider_id()
+    if provider_id != "coinbase":
+        # Keep v1 conservative: only Coinbase pricing implemented.
+        raise HTTPException(status_code=500, detail=f"Unsupported pricing provider: {provider_id}")
 
-    # Rollup by asset.
-    by_asset_map: dict[str, dict[str, Any]] = {}
-    for p in positions:
-        if not p.asset:
-            continue
-        asset = p.asset
-        entry = by_asset_map.setdefault(
-            asset,
-            {
-                "asset": asset,
-                "quote_currency": p.quote_currency or "USD",
-                "total_quantity": Decimal("0"),
-                "price": p.current_price,
-                "market_value": Decimal("0"),
-                "has_price": False,
-                "accounts": [],
-            },
-        )
+    return _build_portfolio_service(coinbase_client, provider_id)
 
-        qty = _parse_decimal(p.quantity)
-        entry["total_quantity"] += qty
-
-        mv = _parse_decimal(p.market_value) if p.market_value is not None else None
-        if mv is not None:
-            entry["market_value"] += mv
-            entry["has_price"] = True
-            if entry.get("price") is None:
-                entry["price"] = p.current_price
-
-        entry["accounts"].append(
-            AssetAccountBreakdown(
-                source=p.source,
-                account_id=p.account_id,
-                quantity=str(qty),
-                market_value=None if mv is None else str(mv),
-            )
-        )
 
-    by_asset: list[AssetValuation] = []
-    for asset, entry in sorted(by_asset_map.items(), key=lambda kv: kv[0]):
-        by_asset.append(
-            AssetValuation(
-                asset=asset,
-                quote_currency=entry["quote_currency"],
-                total_quantity=str(entry["total_quantity"]),
-                price=entry.get("price"),
-                market_value=str(entry["market_value"]) if entry.get("has_price") else None,
-                accounts=entry["accounts"],
-            )
-        )
-
-    # Rollup by account/device.
-    cash_by_acct: dict[tuple[str, str | None], list[CashBalance]] = {}
-    for c in cash:
-        cash_by_acct.setdefault((c.source, c.account_id), []).append(c)
-
-    positions_by_acct: dict[tuple[str, str | None], list[Position]] = {}
-    for p in positions:
-        positions_by_acct.setdefault((p.source, p.account_id), []).append(p)
-
-    by_account: list[AccountValuation] = []
-
-    # Coinbase container.
-    acct_cash = cash_by_acct.get(("coinbase", COINBASE_CONTAINER_ID), [])
-    acct_positions = positions_by_acct.get(("coinbase", COINBASE_CONTAINER_ID), [])
-    acct_total = Decimal("0")
-    for c in acct_cash:
-        acct_total += _parse_decimal(c.total)
-    for p in acct_positions:
-        if p.market_value is not None:
-            acct_total += _parse_decimal(p.market_value)
-
-    if acct_cash or acct_positions:
-        by_account.append(
-            AccountValuation(
-                source="coinbase",
-                account_id=COINBASE_CONTAINER_ID,
-                name="Coinbase",
-                currency="USD",
-                total_value=str(acct_total),
-                cash=acct_cash,
-                positions=acct_positions,
-            )
-        )
-
-    # Cold storage devices.
-    for device in cold_devices:
-        acct_id = device.name
-        acct_positions = positions_by_acct.get(("cold_storage", acct_id), [])
-        if not acct_positions:
-            continue
+@functools.lru_cache(maxsize=1)
+def _build_portfolio_service(client: CoinbaseClient, provider_id: str) -> PortfolioService:
+    # Built once and reused across requests; keyed on the client and provider so
+    # swapping either (config change, tests) yields a fresh service.
+    providers = [
+        CoinbaseHoldingsProvider(client=client, container_id="coinbase"),
+        ColdStorageHoldingsProvider(),
+    ]
+    pricer = CoinbasePricingProvider(client=client)
+    return PortfolioService(providers=providers, pricer=pricer)
 
-        acct_total = Decimal("0")
-        for p in acct_positions:
-            if p.market_value is not None:
-                acct_total += _parse_decimal(p.market_value)
-
-        by_account.append(
-            AccountValuation(
-                source="cold_storage",
-                account_id=acct_id,
-                name=device.name,
-                currency="USD",
-                total_value=str(acct_total),
-                cash=[],
-                positions=acct_positions,
-            )
-        )
 
-    return PortfolioValuation(
-        source="aggregate",
-        as_of=as_of,
-        currency="USD",
-        total_value=str(total),
-        cash_value=str(cash_total),
-        positions_value=str(positions_total),
-        by_asset=by_asset,
-        by_account=by_account,
-        missing_prices=missing_prices,
-    )
+def _invalidate_portfolio_cache() -> None:
+    # Balances change once an order is placed; don't serve a stale valuation.
+    try:
+        svc = _get_portfolio_service()
+    except HTTPException:
+        return
+    svc.invalidate()
 
 
 def _parse_positive_decimal(value: str, field_name: str, errors: list[str]) -> Decimal | None:
-    try:
-        dec = Decimal(value)
-    except (InvalidOperation, TypeError):
+    dec = try_parse_decimal(value)
+    if dec is None:
         errors.append(f"{field_name} must be a valid decimal string")
         return None
 
@@ -339,16 +151,63 @@ def _parse_positive_decimal(value: str, field_name: str, errors: list[str]) -> D
     return dec
 
 
-def _parse_decimal(value: str | None) -> Decimal:
-    if value is None:
-        return Decimal("0")
+async def _accounts_and_prices() -> tuple[List[Dict[str, Any]], Dict[str, Decimal]]:
+    """Fetch Coinbase accounts and their spot prices; Coinbase failures map to 502.
+
+    Both calls go through the client's short TTL caches, so endpoints hit in
+    quick succession (e.g. a dashboard loading snapshot + positions + value)
+    share a single upstream fetch.
+    """
     try:
-        return Decimal(str(value))
-    except (InvalidOperation, TypeError):
-        return Decimal("0")
+        accounts: List[Dict[str, Any]] = await run_in_threadpool(coinbase_client.list_accounts)
+        prices: Dict[str, Decimal] = await run_in_threadpool(
+            coinbase_client.get_spot_prices_for_accounts,
+            accounts,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Coinbase error: {exc}")
+    return accounts, prices
+
+
+# Where an order id may appear in an order response, in priority order. Some
+# responses nest fields under 'success_response'.
+_ORDER_ID_PATHS: tuple[tuple[str, ...], ...] = (
+    ("order_id",),
+    ("orderId",),
+    ("id",),
+    ("success_response", "order_id"),
+    ("success_response", "orderId"),
+    ("success_response", "id"),
+)
+
+
+def _extract_order_id(resp: Any) -> str | None:
+    """Best-effort extraction of the broker order id from common SDK response shapes."""
+    if not isinstance(resp, dict):
+        return None
+    for path in _ORDER_ID_PATHS:
+        value: Any = resp
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if value:
+            return str(value)
+    return None
 
 
 def _validate_trade_request(req: TradeRequest) -> tuple[list[str], list[str]]:
+    errors, warnings, _, _ = _check_trade_request(req)
+    return errors, warnings
+
+
+def _check_trade_request(
+    req: TradeRequest,
+) -> tuple[list[str], list[str], Decimal | None, Decimal | None]:
+    """Deterministic trade checks.
+
+    Returns (errors, warnings, quantity, limit_price), with the Decimals parsed
+    once here so callers don't re-parse them. limit_price is only parsed for
+    limit orders.
+    """
     errors: list[str] = []
     warnings: list[str] = []
 
@@ -359,12 +218,13 @@ def _validate_trade_request(req: TradeRequest) -> tuple[list[str], list[str]]:
         errors.append("symbol is required")
 
     qty = _parse_positive_decimal(req.quantity, "quantity", errors)
+    price: Decimal | None = None
 
     if req.order_type == "limit":
         if req.limit_price is None:
             errors.append("limit_price is required for limit orders")
         else:
-            _parse_positive_decimal(req.limit_price, "limit_price", errors)
+            price = _parse_positive_decimal(req.limit_price, "limit_price", errors)
     else:
         if req.limit_price is not None:
             warnings.append("limit_price is ignored for market orders")
@@ -372,60 +232,63 @@ def _validate_trade_request(req: TradeRequest) -> tuple[list[str], list[str]]:
     if req.quote_currency != "USD":
         warnings.append("v1 assumes USD quote currency for Coinbase spot pricing")
 
-    if qty is not None and qty > Decimal("1000000"):
+    if qty is not None and qty > _MAX_QTY:
         warnings.append("quantity is very large; double-check units")
 
-    return errors, warnings
+    return errors, warnings, qty, price
 
 
-def normalize_coinbase_account(raw: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Map Coinbase account JSON into the agent's normalized schema.
-    """
-    available = raw.get("available_balance", {}) or {}
-    hold = raw.get("hold", {}) or {}
-    total = raw.get("total_balance", {}) or {}
+class _AccountView(NamedTuple):
+    """The fields of a raw Coinbase account the normalizers need, read once."""
+
+    account_id: Any  # raw uuid
+    currency: Any  # raw account currency
+    available: Any  # raw available_balance.value
+    qty: Decimal  # available + hold
+
+
+def _account_view(raw: Dict[str, Any]) -> _AccountView:
+    account_id = raw.get("uuid")
+    currency = raw.get("currency")
+    available = balance_value(raw, "available_balance")
+    hold = balance_value(raw, "hold")
+    if hold is None or (isinstance(hold, str) and hold in ZERO_STRS):
+        # Most wallets carry no hold (and most are empty): skip the second parse
+        # and the add. "0"/"" available balances return ZERO without parsing.
+        return _AccountView(account_id, currency, available, parse_decimal(available))
+    return _AccountView(account_id, currency, available, parse_decimal(available) + parse_decimal(hold))
+
 
-    available_value = available.get("value")
-    hold_value = hold.get("value")
-    total_value = total.get("value")
+# The *_from_parts constructors use model_construct: every field is either a
+# string we built ourselves or copied straight from Coinbase's JSON, so
+# per-field validation is pure overhead on large account lists.
+
+
+def _account_from_parts(raw: Dict[str, Any], view: _AccountView) -> Account:
+    total_value = balance_value(raw, "total_balance")
     if total_value is None:
-        total_value = str(_parse_decimal(available_value) + _parse_decimal(hold_value))
+        total_value = str(view.qty)
 
-    return Account(
+    return Account.model_construct(
         source="coinbase",
         container_id="coinbase",
-        account_id=raw.get("uuid"),
+        account_id=view.account_id,
         name=raw.get("name"),
-        asset=raw.get("currency"),
-        available=available_value,
+        asset=view.currency,
+        available=view.available,
         total=total_value,
-    ).model_dump()
-
-
-def normalize_coinbase_position(raw: Dict[str, Any], price: float | None) -> Dict[str, Any]:
-    """
-    Map a Coinbase account into a position-style record.
-
-    For v0, quantity comes from available_balance.value, symbol == asset,
-    cost_basis is not reconstructed, and current_price is optional.
-    """
-    available_balance = (raw.get("available_balance") or {}).get("value")
-    hold_balance = (raw.get("hold") or {}).get("value")
-    asset = raw.get("currency")
-    if asset is None:
-        asset = ""
+    )
 
-    qty = _parse_decimal(available_balance) + _parse_decimal(hold_balance)
 
-    market_value: Decimal | None = None
-    if price is not None:
-        market_value = qty * Decimal(str(price))
+def _position_from_parts(view: _AccountView, price: Decimal | None) -> Position:
+    asset = view.currency or ""
+    qty = view.qty
+    market_value = None if price is None else qty * price
 
-    return Position(
+    return Position.model_construct(
         source="coinbase",
         container_id="coinbase",
-        account_id=raw.get("uuid"),
+        account_id=view.account_id,
         symbol=asset,  # v0 assumption: spot symbol == asset code
         asset=asset,
         quantity=str(qty),
@@ -433,34 +296,35 @@ def normalize_coinbase_position(raw: Dict[str, Any], price: float | None) -> Dic
         current_price=None if price is None else str(price),
         market_value=None if market_value is None else str(market_value),
         quote_currency="USD",
-    ).model_dump()
-
+    )
 
-def normalize_coinbase_cash_balance(raw: Dict[str, Any]) -> Dict[str, Any] | None:
-    currency = raw.get("currency")
-    if currency not in ("USD", "USDC"):
-        return None
 
-    available = (raw.get("available_balance") or {}).get("value")
-    hold = (raw.get("hold") or {}).get("value")
-    total = (raw.get("total_balance") or {}).get("value")
+def _cash_from_parts(raw: Dict[str, Any], view: _AccountView) -> CashBalance | None:
+    total = balance_value(raw, "total_balance")
     # Treat empty/zero cash balances as absent.
-    computed_total = _parse_decimal(total) if total is not None else (_parse_decimal(available) + _parse_decimal(hold))
+    computed_total = parse_decimal(total) if total is not None else view.qty
     if computed_total <= 0:
         return None
 
-    return CashBalance(
+    return CashBalance.model_construct(
         source="coinbase",
         container_id="coinbase",
-        account_id=raw.get("uuid"),
-        currency=currency,
-        available=available,
+        account_id=view.account_id,
+        currency=view.currency,
+        available=view.available,
         total=str(computed_total),
-    ).model_dump()
+    )
 
 
-@app.get("/agent/accounts")
-async def get_agent_accounts() -> Dict[str, Any]:
+def normalize_coinbase_account(raw: Dict[str, Any]) -> Account:
+    """
+    Map Coinbase account JSON into the agent's normalized schema.
+    """
+    return _account_from_parts(raw, _account_view(raw))
+
+
+@app.get("/agent/accounts", response_model=AccountList)
+async def get_agent_accounts() -> AccountList:
     """
     Unified accounts view, currently only 'coinbase' for v0.
     """
@@ -470,51 +334,31 @@ async def get_agent_accounts() -> Dict[str, Any]:
         raise HTTPException(status_code=502, detail=f"Coinbase error: {exc}")
 
     normalized = [normalize_coinbase_account(a) for a in accounts]
-    return {"source": "coinbase", "accounts": normalized}
+    return AccountList(source="coinbase", accounts=normalized)
 
 
-@app.get("/agent/positions")
-async def get_agent_positions() -> Dict[str, Any]:
+@app.get("/agent/positions", response_model=PositionList)
+async def get_agent_positions() -> PositionList:
     """
     Normalized positions view for Coinbase spot holdings.
 
     Positions are derived from account balances and decorated with a simple
     USD price per asset when available.
     """
-    try:
-        accounts: List[Dict[str, Any]] = await run_in_threadpool(coinbase_client.list_accounts)
-        prices: Dict[str, float] = await run_in_threadpool(
-            coinbase_client.get_spot_prices_for_accounts,
-            accounts,
-        )
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Coinbase error: {exc}")
+    accounts, prices = await _accounts_and_prices()
 
-    positions: List[Dict[str, Any]] = []
+    positions: List[Position] = []
     ignored = settings.get_ignored_assets()
 
     for acct in accounts:
         # Skip empty or cash-only accounts in v0.
-        available_balance = (acct.get("available_balance") or {}).get("value")
-        hold_balance = (acct.get("hold") or {}).get("value")
-        asset = acct.get("currency")
-        if not isinstance(asset, str) or not asset:
-            continue
-
-        if asset.strip().upper() in ignored:
+        view = _account_view(acct)
+        if _asset_kind(view.currency, ignored) != "spot" or view.qty <= 0:
             continue
 
-        if asset in ("USD", "USDC"):
-            continue
-
-        qty = _parse_decimal(available_balance) + _parse_decimal(hold_balance)
-        if qty <= 0:
-            continue
+        positions.append(_position_from_parts(view, prices.get(view.currency)))
 
-        price = prices.get(asset)
-        positions.append(normalize_coinbase_position(acct, price))
-
-    return {"source": "coinbase", "positions": positions}
+    return PositionList(source="coinbase", positions=positions)
 
 
 @app.post("/agent/trades/preview", response_model=TradePreview)
@@ -548,31 +392,35 @@ async def execute_trade(req: TradeRequest, confirm: bool = False) -> TradeExecut
     Requires `confirm=true` and a `client_order_id` for idempotency.
     Until Coinbase order placement is implemented, this returns HTTP 501.
     """
+    # One timestamp for the whole request, whichever branch responds.
+    now = datetime.now(timezone.utc)
+
     if not confirm:
         raise HTTPException(
             status_code=409,
             detail="human confirmation required; re-call with ?confirm=true",
         )
 
-    errors, warnings = _validate_trade_request(req)
+    errors, warnings, qty_dec, price_dec = _check_trade_request(req)
     if not req.client_order_id:
         errors.append("client_order_id is required for execute (idempotency)")
 
     # Execution policy (local safety rails).
-    allowed_symbols = settings.get_allowed_symbols()
+    policy = settings.get_execution_policy()
+    allowed_symbols = policy.allowed_symbols
     if not allowed_symbols:
         errors.append(
             "FINAGENT_ALLOWED_SYMBOLS must be set (comma-separated), e.g. 'BTC,ETH'"
         )
 
-    symbol_upper = (req.symbol or "").strip().upper()
+    symbol_upper = _norm_sym(req.symbol)
     if allowed_symbols and symbol_upper not in allowed_symbols:
         errors.append(f"symbol '{symbol_upper}' not in FINAGENT_ALLOWED_SYMBOLS")
 
-    max_notional = settings.get_max_notional_usd()
+    max_notional = policy.max_notional_usd
     if max_notional is None:
         errors.append("FINAGENT_MAX_NOTIONAL_USD must be a valid decimal string")
-        max_notional = Decimal("0")
+        max_notional = ZERO
 
     if max_notional <= 0:
         errors.append("FINAGENT_MAX_NOTIONAL_USD must be set to > 0")
@@ -581,7 +429,7 @@ async def execute_trade(req: TradeRequest, confirm: bool = False) -> TradeExecut
     if req.order_type != "limit":
         return TradeExecutionResponse(
             source="coinbase",
-            as_of=datetime.now(timezone.utc),
+            as_of=now,
             request=req,
             status="not_implemented",
             message="v1 execution supports limit orders only",
@@ -592,10 +440,6 @@ async def execute_trade(req: TradeRequest, confirm: bool = False) -> TradeExecut
         )
 
     # Notional check (qty * limit_price).
-    qty_dec = _parse_positive_decimal(req.quantity, "quantity", errors)
-    price_dec: Decimal | None = None
-    if req.limit_price is not None:
-        price_dec = _parse_positive_decimal(req.limit_price, "limit_price", errors)
     if qty_dec is not None and price_dec is not None:
         notional = qty_dec * price_dec
         if max_notional > 0 and notional > max_notional:
@@ -606,7 +450,7 @@ async def execute_trade(req: TradeRequest, confirm: bool = False) -> TradeExecut
     if errors:
         return TradeExecutionResponse(
             source="coinbase",
-            as_of=datetime.now(timezone.utc),
+            as_of=now,
             request=req,
             status="rejected",
             message="trade request rejected by deterministic validation",
@@ -616,24 +460,46 @@ async def execute_trade(req: TradeRequest, confirm: bool = False) -> TradeExecut
             execution_ready=False,
         )
 
-    product_id = f"{symbol_upper}-{(req.quote_currency or 'USD').strip().upper()}"
+    product_id = f"{symbol_upper}-{_norm_sym(req.quote_currency, 'USD')}"
     base_size = req.quantity
     limit_price = req.limit_price or ""
 
     # Optional: preview with Coinbase first (server-side sanity check).
+    # Bounded by a tight timeout so a slow preview can't stall the request. Uses
+    # the loop executor directly: run_in_threadpool shields the worker from
+    # cancellation, which would make the timeout ineffective.
+    preview_timeout = settings.get_order_preview_timeout_seconds()
     try:
-        await run_in_threadpool(
-            coinbase_client.preview_limit_order_gtc,
-            symbol_or_product_id=product_id,
-            side=req.side,
-            base_size=base_size,
-            limit_price=limit_price,
-            quote_currency=req.quote_currency,
+        await asyncio.wait_for(
+            asyncio.get_running_loop().run_in_executor(
+                None,
+                functools.partial(
+                    coinbase_client.preview_limit_order_gtc,
+                    symbol_or_product_id=product_id,
+                    side=req.side,
+                    base_size=base_size,
+                    limit_price=limit_price,
+                    quote_currency=req.quote_currency,
+                ),
+            ),
+            timeout=preview_timeout,
+        )
+    except asyncio.TimeoutError:
+        return TradeExecutionResponse(
+            source="coinbase",
+            as_of=now,
+            request=req,
+            status="rejected",
+            message=f"Coinbase preview did not respond within {preview_timeout}s",
+            errors=["coinbase preview timed out"],
+            warnings=warnings,
+            requires_human_confirmation=True,
+            execution_ready=False,
         )
     except Exception as exc:
         return TradeExecutionResponse(
             source="coinbase",
-            as_of=datetime.now(timezone.utc),
+            as_of=now,
             request=req,
             status="rejected",
             message=f"Coinbase preview rejected the order: {exc}",
@@ -657,24 +523,12 @@ async def execute_trade(req: TradeRequest, confirm: bool = False) -> TradeExecut
     except Exception as exc:
         raise HTTPException(status_code=502, detail=f"Coinbase execution error: {exc}")
 
-    broker_order_id = None
-    # Best-effort extraction from common SDK response shapes.
-    for key in ("order_id", "orderId", "id"):
-        if isinstance(resp, dict) and key in resp and resp.get(key):
-            broker_order_id = str(resp.get(key))
-            break
-    if broker_order_id is None and isinstance(resp, dict):
-        # Some responses nest fields under 'success_response'.
-        sr = resp.get("success_response")
-        if isinstance(sr, dict):
-            for key in ("order_id", "orderId", "id"):
-                if sr.get(key):
-                    broker_order_id = str(sr.get(key))
-                    break
+    _invalidate_portfolio_cache()
+    broker_order_id = _extract_order_id(resp)
 
     return TradeExecutionResponse(
         source="coinbase",
-        as_of=datetime.now(timezone.utc),
+        as_of=now,
         request=req,
         status="submitted",
         message="order submitted to Coinbase",
@@ -687,68 +541,142 @@ async def execute_trade(req: TradeRequest, confirm: bool = False) -> TradeExecut
     )
 
 
-@app.get("/agent/snapshot", response_model=PortfolioSnapshot)
-async def get_agent_snapshot() -> PortfolioSnapshot:
-    """
-    Normalized portfolio snapshot for Coinbase.
+def _iter_snapshot_items(
+    accounts: List[Dict[str, Any]], prices: Dict[str, Decimal]
+) -> Iterator[Account | Position | CashBalance]:
+    """Normalize Coinbase accounts for a snapshot in a single pass.
 
-    Includes accounts, positions (non-cash assets), and cash balances (USD/USDC).
+    Each account's balances are read and parsed once. For every account this
+    yields its Account, followed by its CashBalance or Position if it has one.
     """
-    try:
-        accounts: List[Dict[str, Any]] = await run_in_threadpool(coinbase_client.list_accounts)
-        prices: Dict[str, float] = await run_in_threadpool(
-            coinbase_client.get_spot_prices_for_accounts,
-            accounts,
-        )
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Coinbase error: {exc}")
-
-    normalized_accounts = [normalize_coinbase_account(a) for a in accounts]
-
-    positions: List[Dict[str, Any]] = []
-    cash: List[Dict[str, Any]] = []
     ignored = settings.get_ignored_assets()
 
     for acct in accounts:
-        maybe_cash = normalize_coinbase_cash_balance(acct)
-        if maybe_cash is not None:
-            cash.append(maybe_cash)
+        view = _account_view(acct)
+        yield _account_from_parts(acct, view)
+
+        asset = view.currency
+        kind = _asset_kind(asset, ignored)
+        if kind == "cash":
+            maybe_cash = _cash_from_parts(acct, view)
+            if maybe_cash is not None:
+                yield maybe_cash
             continue
 
-        available_balance = (acct.get("available_balance") or {}).get("value")
-        hold_balance = (acct.get("hold") or {}).get("value")
-        asset = acct.get("currency")
-        if not isinstance(asset, str) or not asset:
+        # Skip ignored and empty accounts.
+        if kind != "spot" or view.qty <= 0:
             continue
 
-        if asset.strip().upper() in ignored:
-            continue
+        yield _position_from_parts(view, prices.get(asset))
+
+
+def _snapshot_json_chunks(
+    accounts: List[Dict[str, Any]], prices: Dict[str, Decimal], as_of: datetime
+) -> Iterator[str]:
+    # Same document as /agent/snapshot. Accounts are written as they are
+    # normalized; positions and cash (a subset of accounts) are held until the
+    # accounts array is closed.
+    positions: List[Position] = []
+    cash: List[CashBalance] = []
+
+    yield '{"source":"coinbase","as_of":' + _DATETIME_ADAPTER.dump_json(as_of).decode() + ',"accounts":['
+    sep = ""
+    for item in _iter_snapshot_items(accounts, prices):
+        if isinstance(item, Account):
+            yield sep + item.model_dump_json()
+            sep = ","
+        elif isinstance(item, Position):
+            positions.append(item)
+        else:
+            cash.append(item)
 
-        # Skip empty accounts.
-        qty = _parse_decimal(available_balance) + _parse_decimal(hold_balance)
-        if qty <= 0:
-            continue
+    yield '],"positions":[' + ",".join(p.model_dump_json() for p in positions)
+    yield '],"cash":[' + ",".join(c.model_dump_json() for c in cash) + "]}"
+
+
+# NDJSON record type for each snapshot item.
+_NDJSON_TYPES: Dict[type, str] = {Account: "account", Position: "position", CashBalance: "cash"}
 
-        price = prices.get(asset)
-        positions.append(normalize_coinbase_position(acct, price))
+
+def _snapshot_ndjson_lines(
+    accounts: List[Dict[str, Any]], prices: Dict[str, Decimal], as_of: datetime
+) -> Iterator[str]:
+    # A header line, then one {"type": ..., "data": {...}} line per record in
+    # the order the single pass produces them; nothing is buffered.
+    yield '{"type":"snapshot","source":"coinbase","as_of":' + _DATETIME_ADAPTER.dump_json(as_of).decode() + "}\n"
+    for item in _iter_snapshot_items(accounts, prices):
+        yield '{"type":"' + _NDJSON_TYPES[type(item)] + '","data":' + item.model_dump_json() + "}\n"
+
+
+@app.get("/agent/snapshot", response_model=PortfolioSnapshot)
+async def get_agent_snapshot() -> PortfolioSnapshot:
+    """
+    Normalized portfolio snapshot for Coinbase.
+
+    Includes accounts, positions (non-cash assets), and cash balances (USD/USDC).
+    """
+    accounts, prices = await _accounts_and_prices()
+
+    normalized_accounts: List[Account] = []
+    positions: List[Position] = []
+    cash: List[CashBalance] = []
+    for item in _iter_snapshot_items(accounts, prices):
+        if isinstance(item, Account):
+            normalized_accounts.append(item)
+        elif isinstance(item, Position):
+            positions.append(item)
+        else:
+            cash.append(item)
 
     return PortfolioSnapshot(
         source="coinbase",
         as_of=datetime.now(timezone.utc),
-        accounts=[Account(**a) for a in normalized_accounts],
-        positions=[Position(**p) for p in positions],
-        cash=[CashBalance(**c) for c in cash],
+        accounts=normalized_accounts,
+        positions=positions,
+        cash=cash,
+    )
+
+
+@app.get("/agent/snapshot/stream")
+async def get_agent_snapshot_stream() -> StreamingResponse:
+    """
+    Streaming variant of /agent/snapshot for large portfolios.
+
+    Returns the same JSON document, but accounts are written out as they are
+    normalized instead of after the whole snapshot is built.
+    """
+    accounts, prices = await _accounts_and_prices()
+
+    return StreamingResponse(
+        _snapshot_json_chunks(accounts, prices, datetime.now(timezone.utc)),
+        media_type="application/json",
+    )
+
+
+@app.get("/agent/snapshot.ndjson")
+async def get_agent_snapshot_ndjson() -> StreamingResponse:
+    """
+    Newline-delimited JSON variant of /agent/snapshot.
+
+    The first line is a header with source and as_of. Each following line is
+    an account, position or cash record, written as soon as it is normalized.
+    """
+    accounts, prices = await _accounts_and_prices()
+
+    return StreamingResponse(
+        _snapshot_ndjson_lines(accounts, prices, datetime.now(timezone.utc)),
+        media_type="application/x-ndjson",
     )
 
 
 @app.get("/agent/price", response_model=PriceQuote)
 async def get_agent_price(symbol: str, quote_currency: str = "USD") -> PriceQuote:
     """Get a spot/ticker price for a symbol even if you don't hold it."""
-    sym = (symbol or "").strip().upper()
+    sym = _norm_sym(symbol)
     if not sym:
         raise HTTPException(status_code=400, detail="symbol is required")
 
-    qc = (quote_currency or "USD").strip().upper()
+    qc = _norm_sym(quote_currency, "USD")
     product_id = f"{sym}-{qc}" if "-" not in sym else sym
 
     try:
@@ -771,62 +699,95 @@ async def get_agent_price(symbol: str, quote_currency: str = "USD") -> PriceQuot
     )
 
 
+# Upper bound on symbols per /agent/prices call.
+_MAX_PRICE_SYMBOLS = 100
+
+
+@app.get("/agent/prices", response_model=PriceQuotes)
+async def get_agent_prices(symbols: str, quote_currency: str = "USD") -> PriceQuotes:
+    """Get spot prices for several symbols in one call, e.g. symbols=BTC,ETH.
+
+    Lookups run concurrently (bounded by FINAGENT_PRICE_FETCH_CONCURRENCY) and
+    share the client's price cache. Symbols that cannot be priced are listed in
+    missing_prices instead of failing the whole request.
+    """
+    qc = _norm_sym(quote_currency, "USD")
+
+    product_ids: list[str] = []
+    for raw in symbols.split(","):
+        sym = _norm_sym(raw)
+        if not sym:
+            continue
+        product_id = f"{sym}-{qc}" if "-" not in sym else sym
+        if product_id not in product_ids:
+            product_ids.append(product_id)
+
+    if not product_ids:
+        raise HTTPException(status_code=400, detail="symbols is required")
+    if len(product_ids) > _MAX_PRICE_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"at most {_MAX_PRICE_SYMBOLS} symbols per request")
+
+    limit = asyncio.Semaphore(settings.get_price_fetch_concurrency())
+
+    async def fetch(product_id: str) -> Decimal | None:
+        async with limit:
+            return await run_in_threadpool(
+                coinbase_client.get_spot_price,
+                symbol_or_product_id=product_id,
+                quote_currency=qc,
+            )
+
+    results = await asyncio.gather(*(fetch(pid) for pid in product_ids), return_exceptions=True)
+
+    now = datetime.now(timezone.utc)
+    quotes: list[PriceQuote] = []
+    missing: list[str] = []
+    for product_id, price in zip(product_ids, results):
+        if price is None or isinstance(price, BaseException):
+            missing.append(product_id)
+            continue
+        quotes.append(PriceQuote(source="coinbase", as_of=now, product_id=product_id, price=str(price)))
+
+    return PriceQuotes(source="coinbase", as_of=now, prices=quotes, missing_prices=missing)
+
+
 @app.get("/agent/value", response_model=PortfolioValue)
 async def get_agent_value() -> PortfolioValue:
     """Compute total Coinbase holdings value in USD (cash + spot assets)."""
-    try:
-        accounts: List[Dict[str, Any]] = await run_in_threadpool(coinbase_client.list_accounts)
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=f"Coinbase error: {exc}")
+    accounts, prices = await _accounts_and_prices()
 
-    total_usd = Decimal("0")
-    missing: list[str] = []
+    total_usd = ZERO
+    missing: set[str] = set()
     ignored = settings.get_ignored_assets()
 
-    # Cash wallets (treat USD + USDC as USD equivalent for v1).
+    # One pass: cash wallets (USD + USDC treated as USD for v1) and priced spot assets.
     for acct in accounts:
-        cur = acct.get("currency")
-        if cur in ("USD", "USDC"):
-            available = (acct.get("available_balance") or {}).get("value")
-            hold = (acct.get("hold") or {}).get("value")
-            total_usd += _parse_decimal(available) + _parse_decimal(hold)
-
-    # Spot assets.
-    for acct in accounts:
-        cur = acct.get("currency")
-        if not isinstance(cur, str) or not cur or cur in ("USD", "USDC"):
+        view = _account_view(acct)
+        cur, qty = view.currency, view.qty
+        kind = _asset_kind(cur, ignored)
+        if kind == "skip":
             continue
 
-        if cur.strip().upper() in ignored:
+        if kind == "cash":
+            total_usd += qty
             continue
 
-        available = (acct.get("available_balance") or {}).get("value")
-        hold = (acct.get("hold") or {}).get("value")
-        qty = _parse_decimal(available) + _parse_decimal(hold)
         if qty <= 0:
             continue
 
-        try:
-            price = await run_in_threadpool(
-                coinbase_client.get_spot_price,
-                symbol_or_product_id=cur,
-                quote_currency="USD",
-            )
-        except Exception:
-            price = None
-
+        price = prices.get(cur)
         if price is None:
-            missing.append(cur)
+            missing.add(cur)
             continue
 
-        total_usd += qty * Decimal(str(price))
+        total_usd += qty * price
 
     return PortfolioValue(
         source="coinbase",
         as_of=datetime.now(timezone.utc),
         currency="USD",
         total_value=str(total_usd),
-        missing_prices=sorted(set(missing)),
+        missing_prices=sorted(missing),
     )
 
 
@@ -937,18 +898,10 @@ async def get_agent_container_value(
 
     # If an account_id is provided, return the specific account valuation.
     if account_id is not None:
-        computed = await svc.compute_portfolio()
-        for a in computed.portfolio.by_account:
-            if a.source == src and a.container_id == container_id and a.account_id == account_id:
-                return ContainerSummary(
-                    source=a.source,
-                    container_id=container_id,
-                    account_id=a.account_id,
-                    name=a.name,
-                    currency=a.currency,
-                    total_value=a.total_value,
-                )
-        raise HTTPException(status_code=404, detail="account not found")
+        try:
+            return await svc.get_account_valuation(source=src, container_id=container_id, account_id=account_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="account not found")
 
     try:
         return await svc.get_container_value(source=src, container_id=container_id)
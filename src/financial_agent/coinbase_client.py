@@ -1,18 +1,153 @@
-from typing import Any, Dict, List, Optional
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 from coinbase.rest import RESTClient
+from requests import HTTPError
+from requests.adapters import HTTPAdapter
 
 from . import settings
+from .decimals import parse_decimal, try_parse_decimal
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Keep-alive connections held open to api.coinbase.com. Must cover the price
+# pool plus concurrent request-handler threads, or requests discards the extra
+# connections and later calls pay for a fresh TLS handshake.
+_HTTP_POOL_MAXSIZE = 32
+
+
+@lru_cache(maxsize=16)
+def _price_skip_set(ignored: frozenset[str]) -> frozenset[str]:
+    # Keyed by the (cached) ignored-assets set, so env edits are still seen.
+    return settings.CASH_CURRENCIES | ignored
+
+
+# Account currencies valued against a different spot product in the Coinbase UI.
+_PRICE_SYMBOL_OVERRIDES: Mapping[str, str] = MappingProxyType(
+    {
+        # Staked ETH is valued like ETH in Coinbase UI.
+        "ETH2": "ETH",
+    }
+)
+
+
+# Read-only calls that hit Coinbase's rate limit (HTTP 429) are retried this
+# many times, backing off exponentially (with jitter) from the base delay
+# unless the response names a Retry-After. Order placement is never retried.
+_RATE_LIMIT_RETRIES = 3
+_RATE_LIMIT_BACKOFF_SECONDS = 0.25
+_RATE_LIMIT_MAX_DELAY_SECONDS = 5.0
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    """True if `exc` is an HTTP 429 from Coinbase."""
+    return getattr(getattr(exc, "response", None), "status_code", None) == 429
+
+
+def _rate_limit_delay(exc: HTTPError, attempt: int) -> float | None:
+    """Seconds to wait before retrying `exc`, or None if it isn't a 429."""
+    if not _is_rate_limited(exc):
+        return None
+    response = exc.response
+    try:
+        delay = float(response.headers.get("Retry-After"))  # type: ignore[union-attr]
+    except (AttributeError, TypeError, ValueError):
+        delay = _RATE_LIMIT_BACKOFF_SECONDS * (2**attempt) * random.uniform(1.0, 1.5)
+    return min(max(delay, 0.0), _RATE_LIMIT_MAX_DELAY_SECONDS)
+
+
+def balance_value(account: Dict[str, Any], key: str) -> Any:
+    """Raw `value` of a Coinbase balance object such as account["hold"].
+
+    None when the balance is absent or not an object; no placeholder dict is
+    allocated for the missing case.
+    """
+    balance = account.get(key)
+    return balance.get("value") if isinstance(balance, dict) else None
 
 
 class CoinbaseClient:
     def __init__(self) -> None:
+        # The SDK client (and the credential parsing it needs) is built on first
+        # use, so importing the API or running tests that never reach Coinbase
+        # needs no credentials.
+        self._rest: RESTClient | None = None
+        self._rest_lock = threading.Lock()
+        self._session: Any = None
+
+        # Bounded pool for fanning out independent ticker requests
+        # (FINAGENT_PRICE_FETCH_CONCURRENCY).
+        self._price_pool = ThreadPoolExecutor(
+            max_workers=settings.get_price_fetch_concurrency(),
+            thread_name_prefix="coinbase-price",
+        )
+
+        # Short-lived caches so back-to-back endpoint calls (dashboards, agents)
+        # don't re-hit Coinbase for data that was just fetched.
+        self._accounts_cache: TTLCache[List[Dict[str, Any]]] = TTLCache(
+            ttl_seconds=settings.get_accounts_cache_ttl_seconds(),
+            maxsize=1,
+        )
+        self._price_cache: TTLCache[Decimal] = TTLCache(ttl_seconds=settings.get_price_cache_ttl_seconds())
+
+    @property
+    def _client(self) -> RESTClient:
+        rest = self._rest
+        if rest is None:
+            with self._rest_lock:
+                rest = self._rest
+                if rest is None:
+                    rest = self._rest = self._build_rest_client()
+        return rest
+
+    def _build_rest_client(self) -> RESTClient:
         creds = settings.get_coinbase_credentials()
 
-        # Official Advanced Trade REST client.
-        self._client = RESTClient(api_key=creds.api_key, api_secret=creds.api_secret)
+        # Official Advanced Trade REST client. It keeps a single requests.Session
+        # for its lifetime; widen that session's connection pool so concurrent
+        # calls reuse warm connections.
+        rest = RESTClient(
+            api_key=creds.api_key,
+            api_secret=creds.api_secret,
+            timeout=settings.get_coinbase_timeout_seconds(),
+        )
+        # `session` is an SDK implementation detail, so only tune it when present.
+        self._session = getattr(rest, "session", None)
+        if self._session is not None:
+            self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=_HTTP_POOL_MAXSIZE))
+        return rest
+
+    def _read(self, method: str, **kwargs: Any) -> Any:
+        """Call a read-only RESTClient method, retrying when rate limited."""
+        fn = getattr(self._client, method)
+        attempt = 0
+        while True:
+            try:
+                return fn(**kwargs)
+            except HTTPError as exc:
+                delay = _rate_limit_delay(exc, attempt)
+                if delay is None or attempt >= _RATE_LIMIT_RETRIES:
+                    raise
+            logger.debug("coinbase %s rate limited; retrying in %.2fs", method, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        """Release pooled HTTP connections and worker threads."""
+
+        self._price_pool.shutdown(wait=False, cancel_futures=True)
+        if self._session is not None:
+            self._session.close()
 
     @staticmethod
-    def _ignored_assets() -> set[str]:
+    def _ignored_assets() -> frozenset[str]:
         """Assets to ignore for pricing/valuation.
 
         Configure via FINAGENT_IGNORED_ASSETS (comma-separated). If unset/empty,
@@ -25,14 +160,20 @@ class CoinbaseClient:
         """
         Returns the raw Coinbase Advanced Trade accounts list as a list of dicts.
 
-        Backed by GET /api/v3/brokerage/accounts (List Accounts).
+        Backed by GET /api/v3/brokerage/accounts (List Accounts). Results are
+        cached briefly (FINAGENT_ACCOUNTS_TTL_SECONDS).
         """
+        return list(self._accounts_cache.get_or_load("accounts", self._fetch_accounts))
+
+    def _fetch_accounts(self) -> List[Dict[str, Any]]:
         accounts: list[Dict[str, Any]] = []
-        seen_ids: set[str] = set()
+        # uuid -> first account seen with it; setdefault both checks and records
+        # in one hash operation.
+        by_uuid: Dict[str, Dict[str, Any]] = {}
 
         cursor: str | None = None
         while True:
-            resp = self._client.get_accounts(limit=250, cursor=cursor)  # GET /api/v3/brokerage/accounts
+            resp = self._read("get_accounts", limit=250, cursor=cursor)  # GET /api/v3/brokerage/accounts
             page = self._to_dict(resp)
             page_accounts = page.get("accounts") or []
 
@@ -49,10 +190,8 @@ class CoinbaseClient:
                             d = {"repr": repr(a)}
 
                     uuid = d.get("uuid")
-                    if isinstance(uuid, str) and uuid:
-                        if uuid in seen_ids:
-                            continue
-                        seen_ids.add(uuid)
+                    if isinstance(uuid, str) and uuid and by_uuid.setdefault(uuid, d) is not d:
+                        continue  # duplicate across pages
 
                     accounts.append(d)
 
@@ -63,42 +202,124 @@ class CoinbaseClient:
 
         return accounts
 
-    def get_spot_prices_for_accounts(self, accounts: List[Dict[str, Any]]) -> Dict[str, float]:
+    def get_spot_prices_for_accounts(self, accounts: List[Dict[str, Any]]) -> Dict[str, Decimal]:
         """
         Returns a mapping {asset_symbol: last_trade_price} for non-cash assets
-        in the given accounts.
+        with a non-zero balance (available + hold) in the given accounts.
 
-        Uses Advanced Trade market data endpoint:
-        GET /api/v3/brokerage/market/products/{product_id}/ticker
-        where product_id is assumed to be "{asset}-USD" for v0.
+        Uses Advanced Trade public market data, where product_id is assumed
+        to be "{asset}-USD" for v0. Uncached prices come from one batched
+        GET /api/v3/brokerage/market/products call; products it doesn't price
+        fall back to the per-product ticker, fetched concurrently on a small
+        worker pool.
+
+        Keys are the account currencies as given (so ETH2 maps to the ETH
+        price).
         """
-        print("get_spot_prices_for_accounts 1")
-        ignored = self._ignored_assets()
-        assets: set[str] = set()
+        # Pure cash wallets (v0) and ignored assets, matched in one lookup.
+        skip = _price_skip_set(self._ignored_assets())
+        price_symbols: Dict[str, str] = {}
         for acct in accounts:
             cur = acct.get("currency")
-            # Skip pure cash wallets in v0.
-            if isinstance(cur, str) and cur and cur not in ("USD", "USDC") and cur.upper() not in ignored:
-                assets.add(self._price_symbol_for_asset(cur))
+            if not isinstance(cur, str) or not cur or cur.upper() in skip:
+                continue
+            # Empty (dust) wallets never become positions, so don't price them.
+            if parse_decimal(balance_value(acct, "available_balance")) + parse_decimal(balance_value(acct, "hold")) <= 0:
+                continue
+            price_symbols[cur] = self._price_symbol_for_asset(cur)
+
+        symbols = sorted(set(price_symbols.values()))
+        symbol_prices: Dict[str, Optional[Decimal]] = {}
+        uncached: list[str] = []
+        for symbol in symbols:
+            cached = self._price_cache.get(f"{symbol}-USD")
+            if cached is not None:
+                symbol_prices[symbol] = cached
+            else:
+                uncached.append(symbol)
+
+        logger.debug("pricing %d assets (%d uncached)", len(symbols), len(uncached))
+
+        # One batched products call covers most assets; anything it doesn't
+        # price falls back to the per-product ticker on the worker pool.
+        if uncached:
+            try:
+                batch = self._fetch_product_prices([f"{symbol}-USD" for symbol in uncached])
+            except HTTPError:
+                # Still rate limited after retries: fanning out one ticker call
+                # per product would only add load, so leave them unpriced.
+                logger.warning("coinbase products batch rate limited; %d assets left unpriced", len(uncached))
+                uncached = []
+                batch = {}
+            fallback: list[str] = []
+            for symbol in uncached:
+                price = batch.get(f"{symbol}-USD")
+                if price is None:
+                    fallback.append(symbol)
+                else:
+                    symbol_prices[symbol] = price
+            symbol_prices.update(zip(fallback, self._price_pool.map(self._fetch_usd_price, fallback)))
+
+        prices: Dict[str, Decimal] = {}
+        for cur, symbol in price_symbols.items():
+            price = symbol_prices.get(symbol)
+            if price is not None:
+                prices[cur] = price
 
-        prices: Dict[str, float] = {}
+        return prices
 
-        print("get_spot_prices_for_accounts 2")
-        for asset in assets:
-            print("get_spot_prices_for_accounts 3", asset)
-            product_id = f"{asset}-USD"
-            try:
-                ticker = self._client.get_public_market_trades(product_id=product_id, limit=1)
-                price = self._extract_last_trade_price(ticker)
-                if price is not None:
-                    prices[asset] = float(price)
-            except Exception:
-                continue
+    def _fetch_product_prices(self, product_ids: List[str]) -> Dict[str, Decimal]:
+        """Current prices for several products in one public products call.
+
+        Best-effort: products missing from the response (or without a usable
+        price) are simply absent, and any other failure yields {}. A rate limit
+        that outlasts the retries is re-raised so callers can avoid per-product
+        fallbacks. Prices found are stored in the price cache.
+        """
+        try:
+            resp = self._to_dict(self._read("get_public_products", product_ids=product_ids))
+        except Exception as exc:
+            if _is_rate_limited(exc):
+                raise
+            return {}
 
+        wanted = set(product_ids)
+        prices: Dict[str, Decimal] = {}
+        try:
+            for product in resp.get("products") or []:
+                p = product if isinstance(product, dict) else self._to_dict(product)
+                product_id = p.get("product_id")
+                if product_id not in wanted:
+                    continue
+                price = try_parse_decimal(p.get("price"))
+                if price is None or price <= 0:
+                    continue
+                prices[product_id] = price
+                self._price_cache.set(product_id, price)
+        except Exception:
+            # Malformed response: keep what parsed; the rest fall back to tickers.
+            logger.debug("unexpected coinbase products response", exc_info=True)
         return prices
 
+    def _fetch_usd_price(self, asset: str) -> Optional[Decimal]:
+        """Best-effort last trade price for "{asset}-USD"; None on any failure."""
+        try:
+            return self._cached_last_trade_price(f"{asset}-USD")
+        except Exception:
+            return None
+
+    def _cached_last_trade_price(self, product_id: str) -> Optional[Decimal]:
+        def load() -> Optional[Decimal]:
+            ticker = self._read("get_public_market_trades", product_id=product_id, limit=1)
+            # Keep Coinbase's decimal string exact rather than detouring via float.
+            return try_parse_decimal(self._extract_last_trade_price(ticker))
+
+        return self._price_cache.get_or_load(product_id, load)
+
     @staticmethod
+    @lru_cache(maxsize=256)
     def _normalize_product_id(symbol_or_product_id: str, quote_currency: str = "USD") -> str:
+        # Memoized: the argument space is the handful of symbols/quotes in use.
         s = (symbol_or_product_id or "").strip().upper()
         q = (quote_currency or "USD").strip().upper()
         if "-" in s:
@@ -106,6 +327,7 @@ class CoinbaseClient:
         return f"{s}-{q}"
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _price_symbol_for_asset(asset: str) -> str:
         """Return an asset symbol to use for pricing.
 
@@ -116,13 +338,10 @@ class CoinbaseClient:
         """
 
         a = (asset or "").strip().upper()
-        overrides = {
-            # Staked ETH is valued like ETH in Coinbase UI.
-            "ETH2": "ETH",
-        }
-        return overrides.get(a, a)
+        return _PRICE_SYMBOL_OVERRIDES.get(a, a)
 
     @classmethod
+    @lru_cache(maxsize=1024)
     def _apply_price_overrides(cls, symbol_or_product_id: str, quote_currency: str) -> str:
         s = (symbol_or_product_id or "").strip().upper()
         if "-" in s:
@@ -210,6 +429,9 @@ class CoinbaseClient:
         else:
             raise ValueError("side must be 'buy' or 'sell'")
 
+        # Balances/holds change once an order is placed.
+        self._accounts_cache.clear()
+
         return self._to_dict(resp)
 
     @staticmethod
@@ -245,15 +467,12 @@ class CoinbaseClient:
         *,
         symbol_or_product_id: str,
         quote_currency: str = "USD",
-    ) -> Optional[float]:
+    ) -> Optional[Decimal]:
         """Return the latest observed trade price for a product.
 
-        Uses the public market data endpoint via the SDK.
+        Uses the public market data endpoint via the SDK. Prices are cached
+        briefly (FINAGENT_PRICE_TTL_SECONDS).
         """
         symbol_or_product_id = self._apply_price_overrides(symbol_or_product_id, quote_currency)
         product_id = self._normalize_product_id(symbol_or_product_id, quote_currency=quote_currency)
-        ticker = self._client.get_public_market_trades(product_id=product_id, limit=1)
-        price = self._extract_last_trade_price(ticker)
-        if price is None:
-            return None
-        return float(price)
+        return self._cached_last_trade_price(product_id)
@@ -2,22 +2,28 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from decimal import Decimal, InvalidOperation
 from pathlib import Path
 from typing import Any
 
+from .decimals import try_parse_decimal
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ColdStorageDevice:
     name: str
     holdings: dict[str, str]  # asset -> quantity (decimal string)
 
 
-def _to_decimal_string(value: Any) -> str:
-    try:
-        return str(Decimal(str(value)))
-    except (InvalidOperation, TypeError, ValueError):
-        return "0"
+def _positive_decimal_string(value: Any) -> str | None:
+    """Canonical decimal string for a positive, finite quantity; else None.
+
+    Parses once (through the shared memoized parser) and checks the sign on
+    that same Decimal.
+    """
+    dec = try_parse_decimal(value)
+    if dec is None or not dec.is_finite() or dec <= 0:
+        return None
+    return str(dec)
 
 
 def load_cold_storage_devices(path: Path) -> list[ColdStorageDevice]:
@@ -66,8 +72,8 @@ def load_cold_storage_devices(path: Path) -> list[ColdStorageDevice]:
             for asset, qty in holdings_raw.items():
                 if not isinstance(asset, str) or not asset.strip():
                     continue
-                qty_s = _to_decimal_string(qty)
-                if Decimal(qty_s) <= 0:
+                qty_s = _positive_decimal_string(qty)
+                if qty_s is None:
                     continue
                 holdings[asset.strip().upper()] = qty_s
 
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any
+
+ZERO = Decimal(0)
+
+# Balance strings that parse to exactly Decimal(0); skipped without a parse.
+ZERO_STRS = frozenset({"", "0"})
+
+
+@lru_cache(maxsize=8192)
+def _decimal_from_str(value: str) -> Decimal | None:
+    # Balances, quantities and prices repeat heavily between requests, so
+    # memoize the parse (including the result for unparseable strings).
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        return None
+
+
+def try_parse_decimal(value: Any) -> Decimal | None:
+    """Parse a decimal string (or number); None if it isn't one.
+
+    Decimals are returned as-is; strings skip the str() round-trip.
+    """
+
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return _decimal_from_str(value)
+    if isinstance(value, Decimal):
+        return value
+    return _decimal_from_str(str(value))
+
+
+def parse_decimal(value: Any) -> Decimal:
+    """Lenient parse for balance-style values: missing or invalid -> 0."""
+
+    if value is None or (isinstance(value, str) and value in ZERO_STRS):
+        return ZERO
+    dec = try_parse_decimal(value)
+    return ZERO if dec is None else dec
@@ -8,11 +8,14 @@ def main() -> None:
 	port = settings.get_finagent_port()
 	reload = settings.get_finagent_reload()
 
+	# loop/http stay on "auto": uvicorn[standard] provides uvloop and httptools
+	# where the platform supports them and falls back to asyncio/h11 elsewhere.
 	uvicorn.run(
 		"financial_agent.agent_api:app",
 		host=host,
 		port=port,
 		reload=reload,
+		workers=None if reload else settings.get_finagent_workers(),
 	)
 
 
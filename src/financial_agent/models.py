@@ -43,6 +43,20 @@ class CashBalance(BaseModel):
     total: Optional[str] = None
 
 
+class AccountList(BaseModel):
+    """Normalized accounts for a single source."""
+
+    source: Source
+    accounts: list[Account] = Field(default_factory=list)
+
+
+class PositionList(BaseModel):
+    """Normalized positions for a single source."""
+
+    source: Source
+    positions: list[Position] = Field(default_factory=list)
+
+
 class PortfolioSnapshot(BaseModel):
     source: Source
     as_of: datetime
@@ -60,6 +74,16 @@ class PriceQuote(BaseModel):
     price: str
 
 
+class PriceQuotes(BaseModel):
+    """Spot prices for several products, fetched in one request."""
+
+    source: Source
+    as_of: datetime
+
+    prices: list[PriceQuote] = Field(default_factory=list)
+    missing_prices: list[str] = Field(default_factory=list)
+
+
 class PortfolioValue(BaseModel):
     source: Source
     as_of: datetime
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from decimal import Decimal
 
 from . import settings
+from .decimals import ZERO, parse_decimal
 from .models import (
     AccountValuation,
     AssetAccountBreakdown,
@@ -26,6 +29,32 @@ class PortfolioComputed:
     currency: str
     portfolio: PortfolioValuation
     container_totals: list[ContainerSummary]
+    # (source, container_id, account_id) -> entry in portfolio.by_account
+    by_account_index: dict[tuple[str, str | None, str | None], AccountValuation] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _AssetAgg:
+    """Running per-asset rollup while valuing holdings."""
+
+    quote_currency: str
+    price: str | None
+    total_quantity: Decimal = ZERO
+    market_value: Decimal = ZERO
+    has_price: bool = False
+    accounts: list[AssetAccountBreakdown] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _AccountAgg:
+    """Running per-account rollup while valuing holdings."""
+
+    source: str
+    container_id: str | None
+    account_id: str | None
+    total_value: Decimal = ZERO
+    cash: list[CashBalance] = field(default_factory=list)
+    positions: list[Position] = field(default_factory=list)
 
 
 class PortfolioService:
@@ -37,6 +66,13 @@ class PortfolioService:
     ) -> None:
         self._providers = providers
         self._pricer = pricer
+        # (expires_at, result) of the last compute_portfolio, shared by the
+        # networth/containers/holdings views polled back-to-back.
+        self._cached: tuple[float, PortfolioComputed] | None = None
+        self._compute_lock = asyncio.Lock()
+        # Bumped by invalidate(); a computation that started under an older
+        # generation may reflect pre-order balances and is not stored.
+        self._generation = 0
 
     @property
     def pricing_provider_id(self) -> str:
@@ -52,7 +88,44 @@ class PortfolioService:
         provider = self._get_provider(source)
         return await provider.list_accounts(container_id=container_id)
 
+    def invalidate(self) -> None:
+        """Drop the cached portfolio (e.g. after an order changes balances)."""
+
+        self._generation += 1
+        self._cached = None
+
     async def compute_portfolio(self) -> PortfolioComputed:
+        """Value all holdings, reusing a result younger than FINAGENT_PORTFOLIO_TTL_SECONDS.
+
+        Concurrent callers that miss the cache share a single recomputation.
+        """
+
+        ttl = settings.get_portfolio_cache_ttl_seconds()
+        if ttl <= 0:
+            return await self._compute_portfolio()
+
+        cached = self._fresh_cached()
+        if cached is not None:
+            return cached
+
+        async with self._compute_lock:
+            # Another caller may have refreshed it while we waited.
+            cached = self._fresh_cached()
+            if cached is not None:
+                return cached
+            generation = self._generation
+            computed = await self._compute_portfolio()
+            if generation == self._generation:
+                self._cached = (time.monotonic() + ttl, computed)
+            return computed
+
+    def _fresh_cached(self) -> PortfolioComputed | None:
+        cached = self._cached
+        if cached is None or time.monotonic() >= cached[0]:
+            return None
+        return cached[1]
+
+    async def _compute_portfolio(self) -> PortfolioComputed:
         ignored = settings.get_ignored_assets()
         as_of = datetime.now(timezone.utc)
 
@@ -60,215 +133,161 @@ class PortfolioService:
         containers: list[ContainerRef] = []
         account_names: dict[tuple[str, str, str], str | None] = {}
 
-        for provider in self._providers:
-            provider_containers = await provider.list_containers()
+        # Providers are independent (Coinbase API vs. local file), so gather them
+        # concurrently; results are merged in provider order.
+        gathered = await asyncio.gather(*(self._collect_provider(p) for p in self._providers))
+        for provider_containers, provider_names, provider_holdings in gathered:
             containers.extend(provider_containers)
-            for container in provider_containers:
-                # Best-effort account discovery for name annotation.
-                try:
-                    for a in await provider.list_accounts(container_id=container.container_id):
-                        account_names[(a.source, a.container_id, a.account_id)] = a.name
-                except Exception:
-                    pass
+            account_names.update(provider_names)
+            all_holdings.extend(provider_holdings)
 
-                all_holdings.extend(await provider.get_holdings(container_id=container.container_id))
+        cleaned = self._clean_holdings(all_holdings, ignored)
 
-        # Normalize/clean holdings.
-        cleaned: list[Holding] = []
-        for h in all_holdings:
-            asset = (h.asset or "").strip().upper()
-            if not asset or asset in ignored:
-                continue
-            if h.quantity <= 0:
-                continue
-            cleaned.append(
-                Holding(
+        # Prices for non-cash assets.
+        price_assets = {h.asset for h in cleaned if h.asset not in settings.CASH_CURRENCIES}
+        prices = await self._pricer.get_prices(assets=price_assets, quote_currency="USD")
+
+        # Single pass: build cash/positions and the totals, missing-price set,
+        # per-asset rollup and per-account buckets from the Decimal values
+        # already in hand.
+        cash_total = ZERO
+        positions_total = ZERO
+        missing: set[str] = set()
+        by_asset_map: dict[str, _AssetAgg] = {}
+        by_account_map: dict[tuple[str, str, str | None], _AccountAgg] = {}
+
+        def _account_entry(h: Holding) -> _AccountAgg:
+            key = (h.source, h.container_id or "", h.account_id)
+            entry = by_account_map.get(key)
+            if entry is None:
+                entry = by_account_map[key] = _AccountAgg(
                     source=h.source,
                     container_id=h.container_id,
                     account_id=h.account_id,
-                    asset=asset,
-                    quantity=h.quantity,
-                    quote_currency=(h.quote_currency or "USD").strip().upper(),
                 )
-            )
-
-        # Prices for non-cash assets.
-        price_assets = {h.asset for h in cleaned if h.asset not in ("USD", "USDC")}
-        prices = await self._pricer.get_prices(assets=price_assets, quote_currency="USD")
-
-        cash: list[CashBalance] = []
-        positions: list[Position] = []
+            return entry
 
+        # Per-holding models use model_construct: every field is a string we
+        # just formatted or a code from our own providers, so validating each
+        # one again is pure overhead on large portfolios.
         for h in cleaned:
-            if h.asset in ("USD", "USDC"):
-                cash.append(
-                    CashBalance(
-                        source=h.source,  # type: ignore[arg-type]
-                        container_id=h.container_id,
-                        account_id=h.account_id,
-                        currency=h.asset,
-                        available=None,
-                        total=str(h.quantity),
-                    )
+            acct_entry = _account_entry(h)
+
+            if h.asset in settings.CASH_CURRENCIES:
+                c = CashBalance.model_construct(
+                    source=h.source,  # type: ignore[arg-type]
+                    container_id=h.container_id,
+                    account_id=h.account_id,
+                    currency=h.asset,
+                    available=None,
+                    total=str(h.quantity),
                 )
+                acct_entry.cash.append(c)
+                acct_entry.total_value += h.quantity
+                cash_total += h.quantity
                 continue
 
             price = prices.get(h.asset)
             mv: Decimal | None = None
             if price is not None:
                 mv = h.quantity * price
-
-            positions.append(
-                Position(
-                    source=h.source,  # type: ignore[arg-type]
-                    container_id=h.container_id,
-                    account_id=h.account_id,
-                    symbol=h.asset,
-                    asset=h.asset,
-                    quantity=str(h.quantity),
-                    cost_basis=None,
-                    current_price=None if price is None else str(price),
-                    market_value=None if mv is None else str(mv),
-                    quote_currency="USD",
-                )
+                positions_total += mv
+                acct_entry.total_value += mv
+            else:
+                missing.add(h.asset)
+
+            p = Position.model_construct(
+                source=h.source,  # type: ignore[arg-type]
+                container_id=h.container_id,
+                account_id=h.account_id,
+                symbol=h.asset,
+                asset=h.asset,
+                quantity=str(h.quantity),
+                cost_basis=None,
+                current_price=None if price is None else str(price),
+                market_value=None if mv is None else str(mv),
+                quote_currency="USD",
             )
+            acct_entry.positions.append(p)
 
-        cash_total = sum((Decimal(c.total or "0") for c in cash), start=Decimal("0"))
-        positions_total = sum(
-            (Decimal(p.market_value) for p in positions if p.market_value is not None),
-            start=Decimal("0"),
-        )
-        total = cash_total + positions_total
-
-        missing_prices = sorted({p.asset for p in positions if p.asset and p.market_value is None})
-
-        by_asset_map: dict[str, dict] = {}
-        for p in positions:
-            if not p.asset:
-                continue
-            entry = by_asset_map.setdefault(
-                p.asset,
-                {
-                    "asset": p.asset,
-                    "quote_currency": p.quote_currency or "USD",
-                    "total_quantity": Decimal("0"),
-                    "price": p.current_price,
-                    "market_value": Decimal("0"),
-                    "has_price": False,
-                    "accounts": [],
-                },
-            )
-
-            qty = Decimal(p.quantity or "0")
-            entry["total_quantity"] += qty
-
-            mv = Decimal(p.market_value) if p.market_value is not None else None
+            entry = by_asset_map.get(h.asset)
+            if entry is None:
+                entry = by_asset_map[h.asset] = _AssetAgg(
+                    quote_currency=p.quote_currency or "USD",
+                    price=p.current_price,
+                )
+            entry.total_quantity += h.quantity
             if mv is not None:
-                entry["market_value"] += mv
-                entry["has_price"] = True
-                if entry.get("price") is None:
-                    entry["price"] = p.current_price
+                entry.market_value += mv
+                entry.has_price = True
+                if entry.price is None:
+                    entry.price = p.current_price
 
-            entry["accounts"].append(
-                AssetAccountBreakdown(
+            entry.accounts.append(
+                AssetAccountBreakdown.model_construct(
                     source=p.source,
                     account_id=p.account_id,
                     container_id=p.container_id,
-                    quantity=str(qty),
-                    market_value=None if mv is None else str(mv),
+                    quantity=p.quantity,
+                    market_value=p.market_value,
                 )
             )
 
+        total = cash_total + positions_total
+        missing_prices = sorted(missing)
+
+        # The rollups are built from the trusted per-holding models and
+        # Decimals above, so they skip validation too.
         by_asset: list[AssetValuation] = []
-        for asset, entry in sorted(by_asset_map.items(), key=lambda kv: kv[0]):
+        for asset, entry in sorted(by_asset_map.items()):
             by_asset.append(
-                AssetValuation(
+                AssetValuation.model_construct(
                     asset=asset,
-                    quote_currency=entry["quote_currency"],
-                    total_quantity=str(entry["total_quantity"]),
-                    price=entry.get("price"),
-                    market_value=str(entry["market_value"]) if entry.get("has_price") else None,
-                    accounts=entry["accounts"],
+                    quote_currency=entry.quote_currency,
+                    total_quantity=str(entry.total_quantity),
+                    price=entry.price,
+                    market_value=str(entry.market_value) if entry.has_price else None,
+                    accounts=entry.accounts,
                 )
             )
 
         # Account-level rollup (sub-accounts within a container).
-        by_account_map: dict[tuple[str, str, str | None], dict] = {}
-
-        def _acct_key(source: str, container_id: str, account_id: str | None) -> tuple[str, str, str | None]:
-            return (source, container_id, account_id)
-
-        for c in cash:
-            key = _acct_key(c.source, c.container_id or "", c.account_id)
-            by_account_map.setdefault(
-                key,
-                {
-                    "source": c.source,
-                    "container_id": c.container_id,
-                    "account_id": c.account_id,
-                    "name": None,
-                    "currency": "USD",
-                    "cash": [],
-                    "positions": [],
-                },
-            )["cash"].append(c)
-
-        for p in positions:
-            key = _acct_key(p.source, p.container_id or "", p.account_id)
-            by_account_map.setdefault(
-                key,
-                {
-                    "source": p.source,
-                    "container_id": p.container_id,
-                    "account_id": p.account_id,
-                    "name": None,
-                    "currency": "USD",
-                    "cash": [],
-                    "positions": [],
-                },
-            )["positions"].append(p)
-
         by_account: list[AccountValuation] = []
+        by_account_index: dict[tuple[str, str | None, str | None], AccountValuation] = {}
         for (_src, _container, _acct), entry in sorted(by_account_map.items(), key=lambda kv: (kv[0][0], kv[0][1], kv[0][2] or "")):
-            if entry.get("name") is None and entry.get("account_id") is not None:
-                maybe_name = account_names.get((entry["source"], entry["container_id"], entry["account_id"]))
-                if maybe_name is not None:
-                    entry["name"] = maybe_name
-
-            total_value = Decimal("0")
-            for c in entry["cash"]:
-                total_value += Decimal(c.total or "0")
-            for p in entry["positions"]:
-                if p.market_value is not None:
-                    total_value += Decimal(p.market_value)
-
-            by_account.append(
-                AccountValuation(
-                    source=entry["source"],
-                    container_id=entry.get("container_id"),
-                    account_id=entry["account_id"],
-                    name=entry.get("name"),
-                    currency=entry.get("currency") or "USD",
-                    total_value=str(total_value),
-                    cash=entry["cash"],
-                    positions=entry["positions"],
-                )
+            name = None
+            if entry.account_id is not None:
+                name = account_names.get((entry.source, entry.container_id, entry.account_id))
+
+            valuation = AccountValuation.model_construct(
+                source=entry.source,  # type: ignore[arg-type]
+                container_id=entry.container_id,
+                account_id=entry.account_id,
+                name=name,
+                currency="USD",
+                total_value=str(entry.total_value),
+                cash=entry.cash,
+                positions=entry.positions,
             )
+            by_account.append(valuation)
+            by_account_index[(entry.source, entry.container_id, entry.account_id)] = valuation
 
         # Container totals rollup.
         container_totals_map: dict[tuple[str, str], Decimal] = {}
         container_names: dict[tuple[str, str], str | None] = {(c.source, c.container_id): c.name for c in containers}
 
-        for a in by_account:
-            if not a.container_id:
+        # Summed from the running Decimal account totals rather than re-parsing
+        # the formatted AccountValuation strings.
+        for entry in by_account_map.values():
+            if not entry.container_id:
                 continue
-            key = (a.source, a.container_id)
-            container_totals_map[key] = container_totals_map.get(key, Decimal("0")) + Decimal(a.total_value)
+            key = (entry.source, entry.container_id)
+            container_totals_map[key] = container_totals_map.get(key, ZERO) + entry.total_value
 
         container_totals: list[ContainerSummary] = []
-        for (src, cid), total_value in sorted(container_totals_map.items(), key=lambda kv: (kv[0][0], kv[0][1])):
+        for (src, cid), total_value in sorted(container_totals_map.items()):
             container_totals.append(
-                ContainerSummary(
+                ContainerSummary.model_construct(
                     source=src,  # type: ignore[arg-type]
                     container_id=cid,
                     account_id=None,
@@ -291,7 +310,13 @@ class PortfolioService:
             missing_prices=missing_prices,
         )
 
-        return PortfolioComputed(as_of=as_of, currency="USD", portfolio=portfolio, container_totals=container_totals)
+        return PortfolioComputed(
+            as_of=as_of,
+            currency="USD",
+            portfolio=portfolio,
+            container_totals=container_totals,
+            by_account_index=by_account_index,
+        )
 
     async def get_networth(self) -> NetWorthSummary:
         computed = await self.compute_portfolio()
@@ -309,6 +334,51 @@ class PortfolioService:
                 return c
         raise KeyError("container not found")
 
+    async def get_account_valuation(self, *, source: str, container_id: str, account_id: str) -> ContainerSummary:
+        """Value a single account without computing the whole portfolio.
+
+        Only that container's holdings are loaded and only the account's own
+        assets are priced. Raises KeyError if the account has no holdings.
+        """
+
+        provider = self._get_provider(source)
+        holdings = self._clean_holdings(
+            [h for h in await provider.get_holdings(container_id=container_id) if h.account_id == account_id],
+            settings.get_ignored_assets(),
+        )
+        if not holdings:
+            raise KeyError("account not found")
+
+        price_assets = {h.asset for h in holdings if h.asset not in settings.CASH_CURRENCIES}
+        prices = await self._pricer.get_prices(assets=price_assets, quote_currency="USD") if price_assets else {}
+
+        total_value = ZERO
+        for h in holdings:
+            if h.asset in settings.CASH_CURRENCIES:
+                total_value += h.quantity
+                continue
+            price = prices.get(h.asset)
+            if price is not None:
+                total_value += h.quantity * price
+
+        name = None
+        try:
+            for a in await provider.list_accounts(container_id=container_id):
+                if a.account_id == account_id:
+                    name = a.name
+                    break
+        except Exception:
+            pass
+
+        return ContainerSummary(
+            source=source,  # type: ignore[arg-type]
+            container_id=container_id,
+            account_id=account_id,
+            name=name,
+            currency="USD",
+            total_value=str(total_value),
+        )
+
     async def get_container_holdings(
         self,
         *,
@@ -328,31 +398,32 @@ class PortfolioService:
             raise KeyError("container not found")
 
         # Build holdings from underlying account valuations, optionally filtered.
+        # Totals and quantities are reused as already formatted by
+        # compute_portfolio; nothing here needs Decimal arithmetic.
         holdings: list[HoldingLine] = []
         missing_prices: set[str] = set()
-        total_value = Decimal("0")
-
-        for a in computed.portfolio.by_account:
-            if a.source != source:
-                continue
-            if getattr(a, "container_id", None) != container_id:
-                continue
-            if account_id is not None and a.account_id != account_id:
-                continue
-
-            total_value += Decimal(a.total_value)
 
+        if account_id is not None:
+            match = computed.by_account_index.get((source, container_id, account_id))
+            selected = [match] if match is not None else []
+            total_value = match.total_value if match is not None else "0"
+        else:
+            selected = [
+                a for a in computed.portfolio.by_account if a.source == source and a.container_id == container_id
+            ]
+            total_value = container_total.total_value
+
+        for a in selected:
             for c in a.cash:
-                qty = Decimal(c.total or "0")
-                if qty <= 0:
+                if parse_decimal(c.total) <= 0:
                     continue
                 holdings.append(
-                    HoldingLine(
+                    HoldingLine.model_construct(
                         asset=c.currency,
-                        quantity=str(qty),
+                        quantity=c.total,
                         quote_currency="USD",
                         price="1",
-                        market_value=str(qty),
+                        market_value=c.total,
                         account_id=a.account_id,
                     )
                 )
@@ -363,7 +434,7 @@ class PortfolioService:
                 if p.market_value is None:
                     missing_prices.add(p.asset)
                 holdings.append(
-                    HoldingLine(
+                    HoldingLine.model_construct(
                         asset=p.asset,
                         quantity=p.quantity,
                         quote_currency=p.quote_currency or "USD",
@@ -381,11 +452,63 @@ class PortfolioService:
             account_id=account_id,
             name=name,
             currency="USD",
-            total_value=str(total_value if account_id is not None else Decimal(container_total.total_value)),
+            total_value=total_value,
             holdings=holdings,
             missing_prices=sorted(missing_prices),
         )
 
+    @staticmethod
+    async def _collect_provider(
+        provider: HoldingsProvider,
+    ) -> tuple[list[ContainerRef], dict[tuple[str, str, str], str | None], list[Holding]]:
+        containers = await provider.list_containers()
+
+        # Every container's account listing and holdings are independent, so
+        # request them all at once. Account discovery is best-effort (names
+        # only); a holdings failure still fails the computation.
+        account_lists, holding_lists = await asyncio.gather(
+            asyncio.gather(
+                *(provider.list_accounts(container_id=c.container_id) for c in containers),
+                return_exceptions=True,
+            ),
+            asyncio.gather(*(provider.get_holdings(container_id=c.container_id) for c in containers)),
+        )
+
+        account_names: dict[tuple[str, str, str], str | None] = {}
+        for accounts in account_lists:
+            if isinstance(accounts, BaseException):
+                continue
+            for a in accounts:
+                account_names[(a.source, a.container_id, a.account_id)] = a.name
+
+        holdings: list[Holding] = []
+        for container_holdings in holding_lists:
+            holdings.extend(container_holdings)
+        return containers, account_names, holdings
+
+    @staticmethod
+    def _clean_holdings(holdings: list[Holding], ignored: frozenset[str]) -> list[Holding]:
+        """Normalize asset/quote codes and drop ignored, unnamed and empty holdings."""
+
+        cleaned: list[Holding] = []
+        for h in holdings:
+            asset = (h.asset or "").strip().upper()
+            if not asset or asset in ignored:
+                continue
+            if h.quantity <= 0:
+                continue
+            cleaned.append(
+                Holding(
+                    source=h.source,
+                    container_id=h.container_id,
+                    account_id=h.account_id,
+                    asset=asset,
+                    quantity=h.quantity,
+                    quote_currency=(h.quote_currency or "USD").strip().upper(),
+                )
+            )
+        return cleaned
+
     def _get_provider(self, source: str) -> HoldingsProvider:
         for p in self._providers:
             if getattr(p, "source", None) == source:
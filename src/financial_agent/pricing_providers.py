@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 from decimal import Decimal
 
 from fastapi.concurrency import run_in_threadpool
 
+from . import settings
 from .coinbase_client import CoinbaseClient
 from .providers.protocols import PricingProvider
 
+# Cash is priced at par.
+_ONE = Decimal(1)
+
 
 class CoinbasePricingProvider(PricingProvider):
     provider_id = "coinbase"
@@ -29,19 +34,31 @@ class CoinbasePricingProvider(PricingProvider):
         normalized_assets = set(normalized_map.values())
 
         normalized_prices: dict[str, Decimal] = {}
+        to_fetch: list[str] = []
         for norm in normalized_assets:
-            if norm in ("USD", "USDC"):
-                normalized_prices[norm] = Decimal("1")
-                continue
+            if norm in settings.CASH_CURRENCIES:
+                normalized_prices[norm] = _ONE
+            else:
+                to_fetch.append(norm)
+
+        # Lookups are independent HTTP calls: overlap them, bounded so a large
+        # portfolio doesn't flood Coinbase (FINAGENT_PRICE_FETCH_CONCURRENCY).
+        # A failed lookup counts as "no price".
+        limit = asyncio.Semaphore(settings.get_price_fetch_concurrency())
+
+        async def fetch(norm: str) -> Decimal | None:
+            async with limit:
+                return await run_in_threadpool(
+                    self._client.get_spot_price,
+                    symbol_or_product_id=norm,
+                    quote_currency=qc,
+                )
 
-            price = await run_in_threadpool(
-                self._client.get_spot_price,
-                symbol_or_product_id=norm,
-                quote_currency=qc,
-            )
-            if price is None:
+        results = await asyncio.gather(*(fetch(norm) for norm in to_fetch), return_exceptions=True)
+        for norm, price in zip(to_fetch, results):
+            if price is None or isinstance(price, BaseException):
                 continue
-            normalized_prices[norm] = Decimal(str(price))
+            normalized_prices[norm] = price
 
         out: dict[str, Decimal] = {}
         for original, norm in normalized_map.items():
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from decimal import Decimal
 from typing import Any
 
 from fastapi.concurrency import run_in_threadpool
 
-from ..coinbase_client import CoinbaseClient
+from ..coinbase_client import CoinbaseClient, balance_value
 from .. import settings
+from ..decimals import parse_decimal
 from .protocols import AccountRef, ContainerRef, Holding, HoldingsProvider
 
 
@@ -72,10 +72,10 @@ class CoinbaseHoldingsProvider(HoldingsProvider):
             if not isinstance(uuid, str) or not uuid:
                 continue
 
-            available_balance = (acct.get("available_balance") or {}).get("value")
-            hold_balance = (acct.get("hold") or {}).get("value")
+            available_balance = balance_value(acct, "available_balance")
+            hold_balance = balance_value(acct, "hold")
 
-            qty = _parse_decimal(available_balance) + _parse_decimal(hold_balance)
+            qty = parse_decimal(available_balance) + parse_decimal(hold_balance)
             if qty <= 0:
                 continue
 
@@ -92,11 +92,3 @@ class CoinbaseHoldingsProvider(HoldingsProvider):
 
         return holdings
 
-
-def _parse_decimal(value: str | None) -> Decimal:
-    if value is None:
-        return Decimal("0")
-    try:
-        return Decimal(str(value))
-    except Exception:
-        return Decimal("0")
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from decimal import Decimal
+from fastapi.concurrency import run_in_threadpool
 
-from ..cold_storage import load_cold_storage_devices
+from ..cold_storage import ColdStorageDevice, load_cold_storage_devices
 from .. import settings
+from ..decimals import parse_decimal
 from .protocols import AccountRef, ContainerRef, Holding, HoldingsProvider
 
 
@@ -11,7 +12,7 @@ class ColdStorageHoldingsProvider(HoldingsProvider):
     source = "cold_storage"
 
     async def list_containers(self) -> list[ContainerRef]:
-        devices = load_cold_storage_devices(settings.get_cold_storage_path())
+        devices = await _load_devices()
         return [ContainerRef(source=self.source, container_id=d.name, name=d.name) for d in devices]
 
     async def list_accounts(self, *, container_id: str) -> list[AccountRef]:
@@ -19,7 +20,7 @@ class ColdStorageHoldingsProvider(HoldingsProvider):
         return []
 
     async def get_holdings(self, *, container_id: str) -> list[Holding]:
-        devices = load_cold_storage_devices(settings.get_cold_storage_path())
+        devices = await _load_devices()
         ignored = settings.get_ignored_assets()
 
         device = next((d for d in devices if d.name == container_id), None)
@@ -32,7 +33,7 @@ class ColdStorageHoldingsProvider(HoldingsProvider):
             if not asset_upper or asset_upper in ignored:
                 continue
 
-            qty = _parse_decimal(qty_s)
+            qty = parse_decimal(qty_s)
             if qty <= 0:
                 continue
 
@@ -50,10 +51,6 @@ class ColdStorageHoldingsProvider(HoldingsProvider):
         return holdings
 
 
-def _parse_decimal(value: str | None) -> Decimal:
-    if value is None:
-        return Decimal("0")
-    try:
-        return Decimal(str(value))
-    except Exception:
-        return Decimal("0")
+async def _load_devices() -> list[ColdStorageDevice]:
+    # File IO: keep it off the event loop so it can overlap with Coinbase calls.
+    return await run_in_threadpool(load_cold_storage_devices, settings.get_cold_storage_path())
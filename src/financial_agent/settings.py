@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
@@ -23,26 +24,33 @@ def _env(name: str) -> str | None:
     return value if value else None
 
 
-def get_ignored_assets() -> set[str]:
+@lru_cache(maxsize=16)
+def _parse_symbol_set(raw: str | None) -> frozenset[str]:
+    # Keyed by the raw env value, so edits to the environment are still seen.
+    if not raw:
+        return frozenset()
+    return frozenset(s.strip().upper() for s in raw.split(",") if s.strip())
+
+
+# Currencies valued at par in USD rather than priced via a ticker. They are
+# never subject to FINAGENT_IGNORED_ASSETS.
+CASH_CURRENCIES: frozenset[str] = frozenset({"USD", "USDC"})
+
+
+def get_ignored_assets() -> frozenset[str]:
     """Comma-separated asset symbols to ignore for pricing/valuation."""
 
-    raw = _env("FINAGENT_IGNORED_ASSETS")
-    if not raw:
-        return set()
-    return {s.strip().upper() for s in raw.split(",") if s.strip()}
+    return _parse_symbol_set(_env("FINAGENT_IGNORED_ASSETS"))
 
 
-def get_allowed_symbols() -> set[str]:
+def get_allowed_symbols() -> frozenset[str]:
     """Comma-separated allowlist for execution, e.g. BTC,ETH."""
 
-    raw = _env("FINAGENT_ALLOWED_SYMBOLS")
-    if not raw:
-        return set()
-    return {s.strip().upper() for s in raw.split(",") if s.strip()}
+    return _parse_symbol_set(_env("FINAGENT_ALLOWED_SYMBOLS"))
 
 
-def get_max_notional_usd() -> Decimal | None:
-    raw = _env("FINAGENT_MAX_NOTIONAL_USD")
+@lru_cache(maxsize=16)
+def _parse_max_notional(raw: str | None) -> Decimal | None:
     if not raw:
         return None
     try:
@@ -52,6 +60,32 @@ def get_max_notional_usd() -> Decimal | None:
     return dec
 
 
+def get_max_notional_usd() -> Decimal | None:
+    return _parse_max_notional(_env("FINAGENT_MAX_NOTIONAL_USD"))
+
+
+@dataclass(frozen=True)
+class ExecutionPolicy:
+    """Local safety rails applied to every trade execution."""
+
+    allowed_symbols: frozenset[str]
+    max_notional_usd: Decimal | None
+
+
+@lru_cache(maxsize=16)
+def _build_execution_policy(allowed_raw: str | None, max_notional_raw: str | None) -> ExecutionPolicy:
+    return ExecutionPolicy(
+        allowed_symbols=_parse_symbol_set(allowed_raw),
+        max_notional_usd=_parse_max_notional(max_notional_raw),
+    )
+
+
+def get_execution_policy() -> ExecutionPolicy:
+    """Allowed symbols and max notional, parsed once per distinct env value."""
+
+    return _build_execution_policy(_env("FINAGENT_ALLOWED_SYMBOLS"), _env("FINAGENT_MAX_NOTIONAL_USD"))
+
+
 @dataclass(frozen=True)
 class CoinbaseCredentials:
     api_key: str
@@ -89,6 +123,70 @@ def get_finagent_reload() -> bool:
     return raw.strip().lower() in {"1", "true", "yes"}
 
 
+def get_finagent_workers() -> int:
+    """Uvicorn worker processes (ignored when reload is enabled)."""
+
+    raw = _env("FINAGENT_WORKERS") or "1"
+    try:
+        workers = int(raw)
+    except (TypeError, ValueError):
+        return 1
+    return workers if workers > 0 else 1
+
+
+def _env_seconds(name: str, default: float) -> float:
+    raw = _env(name)
+    if raw is None:
+        return default
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return default
+
+
+def get_accounts_cache_ttl_seconds() -> float:
+    """How long a Coinbase accounts listing is reused (0 disables caching)."""
+
+    return _env_seconds("FINAGENT_ACCOUNTS_TTL_SECONDS", 5.0)
+
+
+def get_price_cache_ttl_seconds() -> float:
+    """How long a fetched spot price is reused (0 disables caching)."""
+
+    return _env_seconds("FINAGENT_PRICE_TTL_SECONDS", 10.0)
+
+
+def get_portfolio_cache_ttl_seconds() -> float:
+    """How long a computed portfolio valuation is reused (0 disables caching)."""
+
+    return _env_seconds("FINAGENT_PORTFOLIO_TTL_SECONDS", 5.0)
+
+
+def get_coinbase_timeout_seconds() -> float:
+    """Per-request HTTP timeout for Coinbase API calls."""
+
+    return _env_seconds("FINAGENT_COINBASE_TIMEOUT_SECONDS", 10.0)
+
+
+def get_order_preview_timeout_seconds() -> float:
+    """Upper bound on the Coinbase order preview made before executing a trade."""
+
+    return _env_seconds("FINAGENT_ORDER_PREVIEW_TIMEOUT_SECONDS", 5.0)
+
+
+def get_price_fetch_concurrency() -> int:
+    """Max spot price lookups in flight at once when pricing many assets."""
+
+    raw = _env("FINAGENT_PRICE_FETCH_CONCURRENCY")
+    if raw is None:
+        return 10
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return 10
+    return value if value > 0 else 10
+
+
 def get_cold_storage_path() -> Path:
     """Path to the user-maintained cold storage holdings file."""
 
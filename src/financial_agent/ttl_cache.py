@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Small thread-safe in-process cache with per-entry expiry.
+
+    - Entries expire `ttl_seconds` after they are stored (monotonic clock).
+    - A TTL <= 0 disables caching: every lookup goes to the loader.
+    - `get_or_load` serializes loads per key, so concurrent callers asking for
+      the same missing/expired key share one upstream call.
+    - `clear()` also discards loads already in flight: their results are
+      returned to the caller but not stored.
+    - `None` results are not cached (treated as "no data, try again").
+    """
+
+    def __init__(self, *, ttl_seconds: float, maxsize: int = 1024) -> None:
+        self._ttl = ttl_seconds
+        self._maxsize = maxsize
+        self._entries: dict[Hashable, tuple[float, V]] = {}
+        # key -> (lock, number of callers holding or waiting on it). Entries are
+        # dropped when the last caller finishes so keys that never cache (None
+        # results, e.g. unknown symbols) don't accumulate.
+        self._load_locks: dict[Hashable, tuple[threading.Lock, int]] = {}
+        self._lock = threading.Lock()
+        # Bumped by clear(); loads that began under an older generation may
+        # carry pre-clear data and are not stored.
+        self._generation = 0
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        self._set_if_current(key, value, None)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], V]) -> V:
+        if self._ttl <= 0:
+            return loader()
+
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            load_lock, waiters = self._load_locks.get(key, (None, 0))
+            if load_lock is None:
+                load_lock = threading.Lock()
+            self._load_locks[key] = (load_lock, waiters + 1)
+
+        try:
+            with load_lock:
+                # Another caller may have refreshed the entry while we waited.
+                value = self.get(key)
+                if value is not None:
+                    return value
+                generation = self._generation
+                value = loader()
+                self._set_if_current(key, value, generation)
+                return value
+        finally:
+            with self._lock:
+                _, waiters = self._load_locks[key]
+                if waiters <= 1:
+                    del self._load_locks[key]
+                else:
+                    self._load_locks[key] = (load_lock, waiters - 1)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _set_if_current(self, key: Hashable, value: V, generation: int | None) -> None:
+        # `generation` None stores unconditionally.
+        if self._ttl <= 0 or value is None:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            if len(self._entries) > self._maxsize:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds self._lock. Drop expired entries first, then the oldest.
+        now = time.monotonic()
+        for k in [k for k, (expires_at, _) in self._entries.items() if now >= expires_at]:
+            del self._entries[k]
+        while len(self._entries) > self._maxsize:
+            del self._entries[next(iter(self._entries))]
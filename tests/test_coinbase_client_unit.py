@@ -1,4 +1,5 @@
 import importlib
+from decimal import Decimal
 
 import pytest
 
@@ -11,7 +12,7 @@ def test_coinbase_list_accounts_paginates_and_dedupes(monkeypatch: pytest.Monkey
     from financial_agent import coinbase_client
 
     class DummyREST:
-        def __init__(self, api_key: str, api_secret: str):
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
             self.calls = []
 
         def get_accounts(self, limit=None, cursor=None, retail_portfolio_id=None, **kwargs):
@@ -49,7 +50,7 @@ def test_coinbase_get_spot_price_applies_eth2_override(monkeypatch: pytest.Monke
     from financial_agent import coinbase_client
 
     class DummyREST:
-        def __init__(self, api_key: str, api_secret: str):
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
             self.last_product_id = None
 
         def get_public_market_trades(self, *, product_id: str, limit: int):
@@ -61,5 +62,334 @@ def test_coinbase_get_spot_price_applies_eth2_override(monkeypatch: pytest.Monke
     client = coinbase_client.CoinbaseClient()
     price = client.get_spot_price(symbol_or_product_id="ETH2", quote_currency="USD")
 
-    assert price == 123.45
+    assert price == Decimal("123.45")
     assert client._client.last_product_id == "ETH-USD"
+
+
+def test_coinbase_spot_prices_for_accounts_keys_by_account_currency(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("COINBASE_API_KEY", "test")
+    monkeypatch.setenv("COINBASE_API_SECRET", "test")
+    monkeypatch.setenv("FINAGENT_IGNORED_ASSETS", "WLUNA")
+
+    from financial_agent import coinbase_client
+
+    class DummyREST:
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
+            self.product_ids = []
+
+        def get_public_products(self, *, product_ids, **kwargs):
+            return {"products": []}
+
+        def get_public_market_trades(self, *, product_id: str, limit: int):
+            self.product_ids.append(product_id)
+            prices = {"BTC-USD": "100000", "ETH-USD": "4000"}
+            if product_id not in prices:
+                raise RuntimeError("unknown product")
+            return {"trades": [{"price": prices[product_id]}]}
+
+    monkeypatch.setattr(coinbase_client, "RESTClient", DummyREST)
+
+    client = coinbase_client.CoinbaseClient()
+    def acct(currency: str, available: str = "1", hold: str = "0"):
+        return {
+            "currency": currency,
+            "available_balance": {"value": available},
+            "hold": {"value": hold},
+        }
+
+    prices = client.get_spot_prices_for_accounts(
+        [
+            acct("USD"),
+            acct("BTC"),
+            acct("ETH"),
+            acct("ETH2", available="0", hold="2"),
+            acct("WLUNA"),
+            acct("DOGE"),
+            acct("SHIB", available="0"),
+            {"currency": "PEPE"},
+        ]
+    )
+
+    assert prices == {"BTC": Decimal("100000"), "ETH": Decimal("4000"), "ETH2": Decimal("4000")}
+    # ETH2 shares the ETH ticker; cash, ignored and empty wallets are never requested.
+    assert sorted(client._client.product_ids) == ["BTC-USD", "DOGE-USD", "ETH-USD"]
+
+
+def test_coinbase_list_accounts_and_spot_price_are_cached(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("COINBASE_API_KEY", "test")
+    monkeypatch.setenv("COINBASE_API_SECRET", "test")
+    monkeypatch.setenv("FINAGENT_ACCOUNTS_TTL_SECONDS", "60")
+    monkeypatch.setenv("FINAGENT_PRICE_TTL_SECONDS", "60")
+
+    from financial_agent import coinbase_client
+
+    class DummyREST:
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
+            self.account_calls = 0
+            self.trade_calls = 0
+
+        def get_accounts(self, limit=None, cursor=None, retail_portfolio_id=None, **kwargs):
+            self.account_calls += 1
+            return {
+                "accounts": [{"uuid": "A", "currency": "BTC", "available_balance": {"value": "1"}}],
+                "has_next": False,
+            }
+
+        def get_public_market_trades(self, *, product_id: str, limit: int):
+            self.trade_calls += 1
+            return {"trades": [{"price": "100"}]}
+
+    monkeypatch.setattr(coinbase_client, "RESTClient", DummyREST)
+
+    client = coinbase_client.CoinbaseClient()
+    assert client.list_accounts() == client.list_accounts()
+    assert client._client.account_calls == 1
+
+    # /agent/price and the batched account pricing share one cache entry.
+    assert client.get_spot_price(symbol_or_product_id="BTC") == Decimal("100")
+    assert client.get_spot_prices_for_accounts(client.list_accounts()) == {"BTC": Decimal("100")}
+    assert client._client.trade_calls == 1
+
+
+def test_coinbase_caches_can_be_disabled(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("COINBASE_API_KEY", "test")
+    monkeypatch.setenv("COINBASE_API_SECRET", "test")
+    monkeypatch.setenv("FINAGENT_ACCOUNTS_TTL_SECONDS", "0")
+
+    from financial_agent import coinbase_client
+
+    class DummyREST:
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
+            self.account_calls = 0
+
+        def get_accounts(self, limit=None, cursor=None, retail_portfolio_id=None, **kwargs):
+            self.account_calls += 1
+            return {"accounts": [], "has_next": False}
+
+    monkeypatch.setattr(coinbase_client, "RESTClient", DummyREST)
+
+    client = coinbase_client.CoinbaseClient()
+    client.list_accounts()
+    client.list_accounts()
+    assert client._client.account_calls == 2
+
+
+def test_coinbase_client_builds_rest_client_on_first_use(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("COINBASE_API_KEY", raising=False)
+    monkeypatch.delenv("COINBASE_API_SECRET", raising=False)
+
+    from financial_agent import coinbase_client
+
+    built: list[str] = []
+
+    class DummyREST:
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
+            built.append(api_key)
+
+        def get_accounts(self, limit=None, cursor=None, **kwargs):
+            return {"accounts": [], "has_next": False}
+
+    monkeypatch.setattr(coinbase_client, "RESTClient", DummyREST)
+
+    # No credentials are needed until Coinbase is actually called.
+    client = coinbase_client.CoinbaseClient()
+    assert built == []
+    with pytest.raises(RuntimeError):
+        client.list_accounts()
+
+    monkeypatch.setenv("COINBASE_API_KEY", "test")
+    monkeypatch.setenv("COINBASE_API_SECRET", "test")
+    assert client.list_accounts() == []
+    assert client.list_accounts() == []
+    assert built == ["test"]
+    client.close()
+
+
+def test_coinbase_spot_prices_for_accounts_uses_batched_products(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("COINBASE_API_KEY", "test")
+    monkeypatch.setenv("COINBASE_API_SECRET", "test")
+    monkeypatch.setenv("FINAGENT_PRICE_TTL_SECONDS", "60")
+
+    from financial_agent import coinbase_client
+
+    class DummyREST:
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
+            self.batches = []
+            self.tickers = []
+
+        def get_public_products(self, *, product_ids, **kwargs):
+            self.batches.append(sorted(product_ids))
+            return {
+                "products": [
+                    {"product_id": "BTC-USD", "price": "100000"},
+                    {"product_id": "DOGE-USD", "price": ""},
+                ]
+            }
+
+        def get_public_market_trades(self, *, product_id: str, limit: int):
+            self.tickers.append(product_id)
+            return {"trades": [{"price": "0.25"}]}
+
+    monkeypatch.setattr(coinbase_client, "RESTClient", DummyREST)
+
+    client = coinbase_client.CoinbaseClient()
+    accounts = [
+        {"currency": c, "available_balance": {"value": "1"}} for c in ("BTC", "DOGE")
+    ]
+
+    assert client.get_spot_prices_for_accounts(accounts) == {
+        "BTC": Decimal("100000"),
+        "DOGE": Decimal("0.25"),
+    }
+    assert client._client.batches == [["BTC-USD", "DOGE-USD"]]
+    # Only the product the batch couldn't price goes to the ticker endpoint.
+    assert client._client.tickers == ["DOGE-USD"]
+
+    # Both prices are now cached; a repeat call makes no requests.
+    client.get_spot_prices_for_accounts(accounts)
+    assert len(client._client.batches) == 1
+    assert client._client.tickers == ["DOGE-USD"]
+
+
+def test_coinbase_reads_retry_when_rate_limited(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("COINBASE_API_KEY", "test")
+    monkeypatch.setenv("COINBASE_API_SECRET", "test")
+    monkeypatch.setenv("FINAGENT_PRICE_TTL_SECONDS", "0")
+
+    import requests
+
+    from financial_agent import coinbase_client
+
+    def http_error(status: int, headers: dict | None = None) -> requests.HTTPError:
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers or {})
+        return requests.HTTPError(f"{status} Client Error", response=response)
+
+    class DummyREST:
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
+            self.errors = [http_error(429, {"Retry-After": "1"}), http_error(429)]
+
+        def get_public_market_trades(self, *, product_id: str, limit: int):
+            if self.errors:
+                raise self.errors.pop(0)
+            return {"trades": [{"price": "42"}]}
+
+    sleeps: list[float] = []
+    monkeypatch.setattr(coinbase_client, "RESTClient", DummyREST)
+    monkeypatch.setattr(coinbase_client.time, "sleep", sleeps.append)
+
+    client = coinbase_client.CoinbaseClient()
+    assert client.get_spot_price(symbol_or_product_id="BTC") == Decimal("42")
+    assert len(sleeps) == 2
+    assert sleeps[0] == 1.0  # Retry-After is honored
+
+    # Other HTTP errors are not retried.
+    client._client.errors = [http_error(500)]
+    with pytest.raises(requests.HTTPError):
+        client.get_spot_price(symbol_or_product_id="BTC")
+    assert len(sleeps) == 2
+
+
+def test_coinbase_rate_limited_price_batch_skips_ticker_fallback(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("COINBASE_API_KEY", "test")
+    monkeypatch.setenv("COINBASE_API_SECRET", "test")
+    monkeypatch.setenv("FINAGENT_PRICE_TTL_SECONDS", "0")
+
+    import requests
+
+    from financial_agent import coinbase_client
+
+    class DummyREST:
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
+            self.status = 429
+            self.tickers = []
+
+        def get_public_products(self, *, product_ids, **kwargs):
+            response = requests.Response()
+            response.status_code = self.status
+            raise requests.HTTPError(f"{self.status} Client Error", response=response)
+
+        def get_public_market_trades(self, *, product_id: str, limit: int):
+            self.tickers.append(product_id)
+            return {"trades": [{"price": "1"}]}
+
+    monkeypatch.setattr(coinbase_client, "RESTClient", DummyREST)
+    monkeypatch.setattr(coinbase_client.time, "sleep", lambda _: None)
+
+    client = coinbase_client.CoinbaseClient()
+    accounts = [{"currency": c, "available_balance": {"value": "1"}} for c in ("BTC", "ETH")]
+
+    # Still throttled after retries: no per-product fan-out.
+    assert client.get_spot_prices_for_accounts(accounts) == {}
+    assert client._client.tickers == []
+
+    # Other request failures fall back to the ticker endpoint.
+    client._client.status = 500
+    assert client.get_spot_prices_for_accounts(accounts) == {"BTC": Decimal("1"), "ETH": Decimal("1")}
+    assert sorted(client._client.tickers) == ["BTC-USD", "ETH-USD"]
+
+
+def test_coinbase_price_cache_does_not_retain_locks_for_unpriced_symbols(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("COINBASE_API_KEY", "test")
+    monkeypatch.setenv("COINBASE_API_SECRET", "test")
+    monkeypatch.setenv("FINAGENT_PRICE_TTL_SECONDS", "60")
+
+    from financial_agent import coinbase_client
+
+    class DummyREST:
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
+            pass
+
+        def get_public_market_trades(self, *, product_id: str, limit: int):
+            if product_id == "BTC-USD":
+                return {"trades": [{"price": "100"}]}
+            return {"trades": []}
+
+    monkeypatch.setattr(coinbase_client, "RESTClient", DummyREST)
+
+    client = coinbase_client.CoinbaseClient()
+    for i in range(500):
+        assert client.get_spot_price(symbol_or_product_id=f"NOPE{i}") is None
+    assert client.get_spot_price(symbol_or_product_id="BTC") == Decimal("100")
+
+    # Unknown symbols aren't cached, and no per-key load lock outlives its load.
+    assert client._price_cache._load_locks == {}
+    assert len(client._price_cache._entries) == 1
+
+
+def test_coinbase_accounts_fetched_across_an_order_are_not_cached(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("COINBASE_API_KEY", "test")
+    monkeypatch.setenv("COINBASE_API_SECRET", "test")
+    monkeypatch.setenv("FINAGENT_ACCOUNTS_TTL_SECONDS", "60")
+
+    from financial_agent import coinbase_client
+
+    client: coinbase_client.CoinbaseClient
+
+    class DummyREST:
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
+            self.account_calls = 0
+            self.race = True
+
+        def get_accounts(self, limit=None, cursor=None, **kwargs):
+            self.account_calls += 1
+            if self.race:
+                # An order lands while this (pre-order) listing is in flight.
+                self.race = False
+                client.place_limit_order_gtc(
+                    client_order_id="o-1", symbol_or_product_id="BTC", side="buy", base_size="1", limit_price="1"
+                )
+            return {"accounts": [{"uuid": "A", "currency": "BTC"}], "has_next": False}
+
+        def limit_order_gtc_buy(self, **kwargs):
+            return {"success": True}
+
+    monkeypatch.setattr(coinbase_client, "RESTClient", DummyREST)
+
+    client = coinbase_client.CoinbaseClient()
+    client.list_accounts()
+    client.list_accounts()
+    assert client._client.account_calls == 2
+    client.list_accounts()
+    assert client._client.account_calls == 2
@@ -51,9 +51,9 @@ def test_agent_portfolio_rolls_up_by_asset_and_by_account(app_client: TestClient
             assert quote_currency == "USD"
             sym = symbol_or_product_id.split("-", 1)[0].upper()
             if sym == "BTC":
-                return 100_000.0
+                return Decimal("100000")
             if sym == "ETH":
-                return 4_000.0
+                return Decimal("4000")
             return None
 
     monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
@@ -119,7 +119,7 @@ def test_agent_portfolio_includes_cold_storage_holdings(app_client: TestClient,
         def get_spot_price(self, *, symbol_or_product_id: str, quote_currency: str = "USD"):
             assert quote_currency == "USD"
             if symbol_or_product_id == "BTC":
-                return 100_000.0
+                return Decimal("100000")
             return None
 
     monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
@@ -167,9 +167,9 @@ def test_agent_networth_and_container_endpoints(app_client: TestClient, monkeypa
             assert quote_currency == "USD"
             sym = symbol_or_product_id.split("-", 1)[0].upper()
             if sym == "ETH":
-                return 4_000.0
+                return Decimal("4000")
             if sym == "BTC":
-                return 100_000.0
+                return Decimal("100000")
             return None
 
     monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
@@ -192,6 +192,20 @@ def test_agent_networth_and_container_endpoints(app_client: TestClient, monkeypa
     ).json()
     assert Decimal(trezor_value["total_value"]) == Decimal("150000")
 
+    eth_value = app_client.get(
+        "/agent/container/value",
+        params={"source": "coinbase", "container_id": "coinbase", "account_id": "eth-1"},
+    )
+    assert eth_value.status_code == 200
+    assert eth_value.json()["name"] == "ETH Wallet"
+    assert Decimal(eth_value.json()["total_value"]) == Decimal("8000")
+
+    unknown = app_client.get(
+        "/agent/container/value",
+        params={"source": "coinbase", "container_id": "coinbase", "account_id": "nope"},
+    )
+    assert unknown.status_code == 404
+
     trezor_holdings = app_client.get(
         "/agent/container/holdings",
         params={"source": "cold_storage", "container_id": "Trezor 2022"},
@@ -216,7 +230,7 @@ def test_agent_pricing_and_container_accounts(app_client: TestClient, monkeypatc
         def get_spot_price(self, *, symbol_or_product_id: str, quote_currency: str = "USD"):
             sym = symbol_or_product_id.split("-", 1)[0].upper()
             if sym == "BTC":
-                return 100_000.0
+                return Decimal("100000")
             return None
 
     monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
@@ -247,7 +261,7 @@ def test_agent_snapshot_includes_container_ids(app_client: TestClient, monkeypat
             return accounts
 
         def get_spot_prices_for_accounts(self, accounts):
-            return {"BTC": 100_000.0}
+            return {"BTC": Decimal("100000")}
 
     monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
 
@@ -257,3 +271,81 @@ def test_agent_snapshot_includes_container_ids(app_client: TestClient, monkeypat
     assert all(a.get("container_id") == "coinbase" for a in snap["accounts"])
     assert all(p.get("container_id") == "coinbase" for p in snap["positions"])
     assert all(c.get("container_id") == "coinbase" for c in snap["cash"])
+
+
+def test_agent_portfolio_reports_failed_price_lookups_as_missing(
+    app_client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    from financial_agent import agent_api
+
+    accounts = [
+        _acct("USD", available="10", hold="0", uuid="usd-1"),
+        _acct("BTC", available="1", hold="0", uuid="btc-1"),
+        _acct("SOL", available="3", hold="0", uuid="sol-1"),
+    ]
+
+    class DummyCoinbase:
+        def list_accounts(self):
+            return accounts
+
+        def get_spot_price(self, *, symbol_or_product_id: str, quote_currency: str = "USD"):
+            if symbol_or_product_id.upper().startswith("SOL"):
+                raise RuntimeError("ticker unavailable")
+            return Decimal("100")
+
+    monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
+
+    resp = app_client.get("/agent/portfolio")
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert Decimal(data["total_value"]) == Decimal("110")
+    assert data["missing_prices"] == ["SOL"]
+
+
+def test_agent_portfolio_views_share_cached_computation(app_client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    from financial_agent import agent_api
+
+    monkeypatch.setenv("FINAGENT_PORTFOLIO_TTL_SECONDS", "60")
+
+    calls = {"accounts": 0}
+    accounts = [_acct("USD", available="100", hold="0", uuid="usd-1")]
+
+    class DummyCoinbase:
+        def list_accounts(self):
+            calls["accounts"] += 1
+            return accounts
+
+        def get_spot_price(self, *, symbol_or_product_id: str, quote_currency: str = "USD"):
+            return None
+
+    monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
+
+    first = app_client.get("/agent/networth").json()
+    seen = calls["accounts"]
+    assert app_client.get("/agent/containers").status_code == 200
+    assert app_client.get("/agent/networth").json() == first
+    assert calls["accounts"] == seen
+
+    # Invalidation (as after a submitted order) forces a recompute.
+    accounts[0] = _acct("USD", available="250", hold="0", uuid="usd-1")
+    agent_api._invalidate_portfolio_cache()
+    assert Decimal(app_client.get("/agent/networth").json()["total_value"]) == Decimal("250")
+    assert calls["accounts"] > seen
+
+    # An invalidation that lands mid-computation (an order placed while the
+    # portfolio is being valued) must not let that stale result be cached.
+    race = {"pending": True}
+
+    def list_accounts_racing_an_order():
+        calls["accounts"] += 1
+        if race.pop("pending", False):
+            agent_api._invalidate_portfolio_cache()
+        return accounts
+
+    monkeypatch.setattr(agent_api.coinbase_client, "list_accounts", list_accounts_racing_an_order)
+    agent_api._invalidate_portfolio_cache()
+    app_client.get("/agent/networth")
+    seen = calls["accounts"]
+    app_client.get("/agent/networth")
+    assert calls["accounts"] > seen
@@ -0,0 +1,120 @@
+import importlib
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture()
+def app_client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    # Ensure agent_api can import without requiring real credentials.
+    monkeypatch.setenv("COINBASE_API_KEY", "test")
+    monkeypatch.setenv("COINBASE_API_SECRET", "test")
+    monkeypatch.setenv("FINAGENT_ALLOWED_SYMBOLS", "BTC")
+    monkeypatch.setenv("FINAGENT_MAX_NOTIONAL_USD", "1000")
+
+    from financial_agent import agent_api
+
+    importlib.reload(agent_api)
+    return TestClient(agent_api.app)
+
+
+_LIMIT_BUY = {
+    "symbol": "BTC",
+    "side": "buy",
+    "order_type": "limit",
+    "quantity": "0.001",
+    "limit_price": "50000",
+    "client_order_id": "test-order-1",
+}
+
+
+def test_execute_trade_rejects_when_preview_times_out(
+    app_client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    from financial_agent import agent_api
+
+    monkeypatch.setenv("FINAGENT_ORDER_PREVIEW_TIMEOUT_SECONDS", "0.05")
+    release = threading.Event()
+    placed: list[str] = []
+
+    class DummyCoinbase:
+        def preview_limit_order_gtc(self, **kwargs):
+            release.wait(timeout=5)
+            return {}
+
+        def place_limit_order_gtc(self, **kwargs):
+            placed.append(kwargs["client_order_id"])
+            return {"order_id": "abc"}
+
+    monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
+
+    try:
+        resp = app_client.post("/agent/trades/execute?confirm=true", json=_LIMIT_BUY)
+    finally:
+        release.set()
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "rejected"
+    assert data["errors"] == ["coinbase preview timed out"]
+    assert placed == []
+
+
+def test_execute_trade_places_order_after_preview(
+    app_client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    from financial_agent import agent_api
+
+    class DummyCoinbase:
+        def preview_limit_order_gtc(self, **kwargs):
+            return {}
+
+        def place_limit_order_gtc(self, **kwargs):
+            return {"order_id": "abc"}
+
+    monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
+
+    resp = app_client.post("/agent/trades/execute?confirm=true", json=_LIMIT_BUY)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "submitted"
+    assert data["broker_order_id"] == "abc"
+
+
+def test_extract_order_id_handles_nested_success_response(app_client: TestClient):
+    from financial_agent import agent_api
+
+    assert agent_api._extract_order_id({"order_id": "a", "success_response": {"order_id": "b"}}) == "a"
+    assert agent_api._extract_order_id({"success": True, "success_response": {"order_id": "b"}}) == "b"
+    assert agent_api._extract_order_id({"id": "", "success_response": {"orderId": 7}}) == "7"
+    assert agent_api._extract_order_id({"success_response": "oops"}) is None
+    assert agent_api._extract_order_id(None) is None
+
+
+def test_execute_trade_reports_each_invalid_field_once(app_client: TestClient):
+    resp = app_client.post(
+        "/agent/trades/execute?confirm=true",
+        json={**_LIMIT_BUY, "quantity": "abc"},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "rejected"
+    assert data["errors"] == ["quantity must be a valid decimal string"]
+
+
+def test_execute_trade_policy_follows_environment(
+    app_client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    order = {**_LIMIT_BUY, "symbol": "ETH"}
+
+    resp = app_client.post("/agent/trades/execute?confirm=true", json=order)
+    assert "symbol 'ETH' not in FINAGENT_ALLOWED_SYMBOLS" in resp.json()["errors"]
+
+    monkeypatch.setenv("FINAGENT_ALLOWED_SYMBOLS", "BTC,ETH")
+    monkeypatch.setenv("FINAGENT_MAX_NOTIONAL_USD", "10")
+
+    resp = app_client.post("/agent/trades/execute?confirm=true", json=order)
+    errors = resp.json()["errors"]
+    assert not any("FINAGENT_ALLOWED_SYMBOLS" in e for e in errors)
+    assert any("exceeds FINAGENT_MAX_NOTIONAL_USD" in e for e in errors)
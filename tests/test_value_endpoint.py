@@ -1,4 +1,5 @@
 import importlib
+import json
 from decimal import Decimal
 
 import pytest
@@ -47,9 +48,8 @@ def test_agent_value_sums_cash_and_spot_assets_and_ignores_configured_assets(
         def list_accounts(self):
             return accounts
 
-        def get_spot_price(self, *, symbol_or_product_id: str, quote_currency: str = "USD"):
-            prices = {"BTC": 100_000.0, "ETH": 4_000.0}
-            return prices.get(symbol_or_product_id)
+        def get_spot_prices_for_accounts(self, accounts):
+            return {"BTC": Decimal("100000"), "ETH": Decimal("4000")}
 
     monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
 
@@ -82,8 +82,8 @@ def test_agent_value_reports_missing_prices_for_non_ignored_assets(
         def list_accounts(self):
             return accounts
 
-        def get_spot_price(self, *, symbol_or_product_id: str, quote_currency: str = "USD"):
-            return None
+        def get_spot_prices_for_accounts(self, accounts):
+            return {}
 
     monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
 
@@ -111,7 +111,7 @@ def test_agent_positions_omits_ignored_assets(app_client: TestClient, monkeypatc
             return accounts
 
         def get_spot_prices_for_accounts(self, accounts):
-            return {"BTC": 100_000.0, "WLUNA": 0.01}
+            return {"BTC": Decimal("100000"), "WLUNA": Decimal("0.01")}
 
     monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
 
@@ -138,7 +138,7 @@ def test_agent_snapshot_omits_ignored_assets(app_client: TestClient, monkeypatch
             return accounts
 
         def get_spot_prices_for_accounts(self, accounts):
-            return {"BTC": 100_000.0, "WLUNA": 0.01}
+            return {"BTC": Decimal("100000"), "WLUNA": Decimal("0.01")}
 
     monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
 
@@ -148,3 +148,141 @@ def test_agent_snapshot_omits_ignored_assets(app_client: TestClient, monkeypatch
 
     pos_assets = sorted([p["asset"] for p in data["positions"]])
     assert pos_assets == ["BTC"]
+
+
+def test_agent_snapshot_stream_matches_snapshot(app_client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    from financial_agent import agent_api
+
+    monkeypatch.setenv("FINAGENT_IGNORED_ASSETS", "WLUNA")
+
+    accounts = [
+        _acct("USD", available="10", hold="0"),
+        _acct("BTC", available="0.1", hold="0.02"),
+        _acct("ETH", available="0", hold="0"),
+        _acct("WLUNA", available="999", hold="0"),
+    ]
+
+    class DummyCoinbase:
+        def list_accounts(self):
+            return accounts
+
+        def get_spot_prices_for_accounts(self, accounts):
+            return {"BTC": Decimal("100000"), "WLUNA": Decimal("0.01")}
+
+    monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
+
+    streamed = app_client.get("/agent/snapshot/stream")
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"] == "application/json"
+
+    expected = app_client.get("/agent/snapshot").json()
+    data = streamed.json()
+    data.pop("as_of")
+    expected.pop("as_of")
+    assert data == expected
+
+    ndjson = app_client.get("/agent/snapshot.ndjson")
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    header, *records = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert header["type"] == "snapshot" and header["source"] == "coinbase"
+    by_type: dict[str, list] = {"account": [], "position": [], "cash": []}
+    for r in records:
+        by_type[r["type"]].append(r["data"])
+    assert by_type == {
+        "account": expected["accounts"],
+        "position": expected["positions"],
+        "cash": expected["cash"],
+    }
+
+
+def test_agent_prices_batches_and_reports_missing(app_client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    from financial_agent import agent_api
+
+    calls: list[str] = []
+
+    class DummyCoinbase:
+        def get_spot_price(self, *, symbol_or_product_id: str, quote_currency: str = "USD"):
+            calls.append(symbol_or_product_id)
+            if symbol_or_product_id == "BTC-USD":
+                return Decimal("100000")
+            if symbol_or_product_id == "ETH-USD":
+                raise RuntimeError("boom")
+            return None
+
+    monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
+
+    resp = app_client.get("/agent/prices", params={"symbols": "btc, ETH,BTC,,DOGE"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [(q["product_id"], q["price"]) for q in data["prices"]] == [("BTC-USD", "100000")]
+    assert data["missing_prices"] == ["ETH-USD", "DOGE-USD"]
+    assert sorted(calls) == ["BTC-USD", "DOGE-USD", "ETH-USD"]
+
+    assert app_client.get("/agent/prices", params={"symbols": " , "}).status_code == 400
+
+
+def test_agent_snapshot_is_gzipped_when_accepted(app_client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    from financial_agent import agent_api
+
+    accounts = [_acct(f"C{i}", available="1", hold="0") for i in range(50)]
+
+    class DummyCoinbase:
+        def list_accounts(self):
+            return accounts
+
+        def get_spot_prices_for_accounts(self, accounts):
+            return {}
+
+    monkeypatch.setattr(agent_api, "coinbase_client", DummyCoinbase())
+
+    resp = app_client.get("/agent/snapshot", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert len(resp.json()["accounts"]) == 50
+
+    small = app_client.get("/agent/pricing", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    # Streaming endpoints flush records as they go, so they are never gzipped.
+    for path in ("/agent/snapshot/stream", "/agent/snapshot.ndjson"):
+        streamed = app_client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert streamed.status_code == 200
+        assert "content-encoding" not in streamed.headers
+
+
+def test_agent_value_survives_unexpected_price_batch_errors(app_client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    from financial_agent import agent_api, coinbase_client
+
+    monkeypatch.setenv("FINAGENT_PRICE_TTL_SECONDS", "0")
+
+    class DummyREST:
+        def __init__(self, api_key: str, api_secret: str, **kwargs):
+            pass
+
+        def get_accounts(self, limit=None, cursor=None, **kwargs):
+            return {
+                "accounts": [
+                    _acct("USD", available="10"),
+                    _acct("BTC", available="1"),
+                    _acct("ETH", available="2"),
+                ],
+                "has_next": False,
+            }
+
+        def get_public_products(self, *, product_ids, **kwargs):
+            raise ValueError("unexpected SDK response")
+
+        def get_public_market_trades(self, *, product_id: str, limit: int):
+            if product_id == "ETH-USD":
+                return {"trades": [{"price": "4000"}]}
+            raise KeyError(product_id)
+
+    monkeypatch.setattr(coinbase_client, "RESTClient", DummyREST)
+    monkeypatch.setattr(agent_api, "coinbase_client", coinbase_client.CoinbaseClient())
+
+    resp = app_client.get("/agent/value")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert Decimal(data["total_value"]) == Decimal("10") + Decimal("8000")
+    assert data["missing_prices"] == ["BTC"]